@@ -0,0 +1,84 @@
+"""Compare integer-paise salary arithmetic with decimal.Decimal and floats.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_money --employees 200000
+"""
+import argparse
+import random
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from paypro.money import div_round, to_paise
+from paypro.rules import load_rule_set
+
+_CENT = Decimal("0.01")
+_RATES = [Decimal(rate) for rate in ("0.10", "0.08", "0.02", "0.05", "0.12")]
+_FLOAT_RATES = [float(rate) for rate in _RATES]
+_INT_RATES = [(10, 100), (8, 100), (2, 100), (5, 100), (12, 100)]
+
+
+def with_floats(inputs):
+    # The previous arithmetic: floats, rounded only for display.
+    out = []
+    for gross, present, total in inputs:
+        proportional = gross * present / total
+        out.append([round(proportional * rate, 2) for rate in _FLOAT_RATES])
+    return out
+
+
+def with_decimal(inputs):
+    out = []
+    for gross, present, total in inputs:
+        proportional = (Decimal(str(gross)) * present / total).quantize(_CENT, ROUND_HALF_UP)
+        out.append([(proportional * rate).quantize(_CENT, ROUND_HALF_UP) for rate in _RATES])
+    return out
+
+
+def with_paise(inputs):
+    out = []
+    for gross, present, total in inputs:
+        proportional = div_round(to_paise(gross) * present, total)
+        out.append([div_round(proportional * num, den) for num, den in _INT_RATES])
+    return out
+
+
+def timed(func, inputs):
+    started = time.perf_counter()
+    func(inputs)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    inputs = []
+    for _ in range(args.employees):
+        total = rng.randint(28, 31)
+        inputs.append((round(rng.uniform(10000, 500000), 2), rng.randint(0, total), total))
+
+    print(f"{'arithmetic':<28}{'seconds':>10}{'employees/s':>14}")
+    for name, func in (("float", with_floats), ("decimal.Decimal", with_decimal),
+                       ("int paise", with_paise)):
+        seconds = timed(func, inputs)
+        print(f"{name:<28}{seconds:>10.3f}{args.employees / seconds:>14,.0f}")
+
+    rules = load_rule_set()
+    started = time.perf_counter()
+    for gross, present, total in inputs:
+        rules.evaluate(gross, present, total)
+    seconds = time.perf_counter() - started
+    print(f"{'rules.evaluate (scalar)':<28}{seconds:>10.3f}{args.employees / seconds:>14,.0f}")
+
+    mismatched = sum(
+        [Decimal(p).scaleb(-2) for p in paise] != decimals
+        for paise, decimals in zip(with_paise(inputs), with_decimal(inputs)))
+    print(f"int paise vs Decimal ROUND_HALF_UP: {mismatched} employees differ")
+
+
+if __name__ == "__main__":
+    main()
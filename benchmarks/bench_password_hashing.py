@@ -0,0 +1,62 @@
+"""Measure scrypt login throughput per core at each work factor.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_password_hashing --costs 13 14 15 --logins 64
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from paypro.passwords import DEFAULT_R, PasswordHasher
+
+
+def measure(log2_n, r, logins, workers):
+    hasher = PasswordHasher(n=2 ** log2_n, r=r, workers=workers)
+    stored = hasher.hash("correct horse battery staple")
+
+    def login(_):
+        started = time.perf_counter()
+        if not hasher.verify("correct horse battery staple", stored):
+            raise AssertionError("benchmark password did not verify")
+        return time.perf_counter() - started
+
+    # More callers than hasher workers, as when many sessions log in at once.
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers * 4) as callers:
+        latencies = sorted(callers.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+
+    logins_per_sec = logins / elapsed
+    return {
+        "n": 2 ** log2_n,
+        "memory_mb": round(128 * 2 ** log2_n * r / 2 ** 20, 1),
+        "logins_per_sec": round(logins_per_sec, 1),
+        "per_core": round(logins_per_sec / workers, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", type=int, nargs="+", default=[12, 13, 14, 15],
+                        help="log2 of the scrypt n parameter to try")
+    parser.add_argument("--r", type=int, default=DEFAULT_R)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"workers: {args.workers}")
+    print(f"{'n':>8}{'MB/hash':>9}{'logins/s':>10}{'per core':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for log2_n in args.costs:
+        result = measure(log2_n, args.r, args.logins, args.workers)
+        print(f"{result['n']:>8}{result['memory_mb']:>9}{result['logins_per_sec']:>10}"
+              f"{result['per_core']:>10}{result['p50_ms']:>9}{result['p99_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Measure slip ID throughput and check for collisions across threads and processes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slip_ids --ids 2000000 --workers 4
+
+Exits with status 1 if the new generator produced a duplicate ID or an
+out-of-order one anywhere, so it can run as a check; pass ``--no-rate``
+to skip the throughput table.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from paypro.ids import new_slip_id, new_slip_ids
+
+
+def legacy_slip_id():
+    # The previous SlipIDGenerator.generate, kept here for comparison.
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return f"SLIP-{timestamp}-{random.randint(1000, 9999)}"
+
+
+def rate(func, count):
+    started = time.perf_counter()
+    ids = func(count)
+    elapsed = time.perf_counter() - started
+    return ids, count / elapsed
+
+
+def one_by_one(generate):
+    return lambda count: [generate() for _ in range(count)]
+
+
+def _worker(count):
+    ids = new_slip_ids(count)
+    return ids, ids == sorted(ids)
+
+
+def check_threads(count, threads):
+    results = [None] * threads
+
+    def run(slot):
+        ids = [new_slip_id() for _ in range(count // threads)]
+        results[slot] = ids
+
+    workers = [threading.Thread(target=run, args=(slot,)) for slot in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    ids = [slip_id for chunk in results for slip_id in chunk]
+    return len(ids), len(ids) - len(set(ids)), all(chunk == sorted(chunk) for chunk in results)
+
+
+def check_processes(count, workers):
+    per_worker = count // workers
+    seen = set()
+    total = 0
+    ordered = True
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for ids, in_order in executor.map(_worker, [per_worker] * workers):
+            total += len(ids)
+            seen.update(ids)
+            ordered = ordered and in_order
+    return total, total - len(seen), ordered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=2000000,
+                        help="IDs minted for each collision check")
+    parser.add_argument("--rate-ids", type=int, default=500000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-rate", action="store_true",
+                        help="only run the collision and ordering checks")
+    args = parser.parse_args(argv)
+    failed = False
+
+    if not args.no_rate:
+        print(f"{'generator':<26}{'ids/s':>12}{'collisions':>12}")
+        for name, func, checked in (("legacy (second + random)", one_by_one(legacy_slip_id), False),
+                                    ("new_slip_id", one_by_one(new_slip_id), True),
+                                    ("new_slip_ids (batch)", new_slip_ids, True)):
+            ids, per_sec = rate(func, args.rate_ids)
+            collisions = len(ids) - len(set(ids))
+            # The legacy generator is expected to collide; it is only shown.
+            failed |= checked and (collisions > 0 or ids != sorted(ids))
+            print(f"{name:<26}{per_sec:>12,.0f}{collisions:>12,}")
+
+    total, collisions, ordered = check_threads(args.ids, args.threads)
+    failed |= collisions > 0 or not ordered
+    print(f"threads:   {args.threads} x {total // args.threads:,} ids, "
+          f"{collisions} collisions, per-thread order {'ok' if ordered else 'BROKEN'}")
+    total, collisions, ordered = check_processes(args.ids, args.workers)
+    failed |= collisions > 0 or not ordered
+    print(f"processes: {args.workers} x {total // args.workers:,} ids, "
+          f"{collisions} collisions, per-process order {'ok' if ordered else 'BROKEN'}")
+
+    print("FAILED: duplicate or out-of-order slip IDs" if failed else "ok")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
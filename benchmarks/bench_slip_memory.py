@@ -0,0 +1,101 @@
+"""Compare memory held by per-employee slip objects and the columnar SlipBatch.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slip_memory --employees 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from paypro.batch import EmployeeSalaryBatch
+from paypro.salary import EmployeeSalary
+
+
+class LegacyEmployeeSalary:
+    # The previous representation: a plain __dict__ per employee.
+    def __init__(self, emp_salary):
+        for name in EmployeeSalary.__slots__[:-1]:
+            setattr(self, name, getattr(emp_salary, name))
+
+
+def _inputs(size):
+    employee_ids = [f"EMP{i:06d}" for i in range(size)]
+    gross = [30000.0 + (i % 500) * 137.5 for i in range(size)]
+    present = [20 + i % 11 for i in range(size)]
+    return employee_ids, gross, present, [30] * size
+
+
+def legacy_objects_and_dicts(inputs):
+    slips = []
+    for employee_id, gross, present, total in zip(*inputs):
+        emp_salary = EmployeeSalary(employee_id, gross, present, total, "benchmark")
+        emp_salary.calculate()
+        slips.append((LegacyEmployeeSalary(emp_salary), emp_salary.to_dict()))
+    return slips
+
+
+def slotted_objects_and_dicts(inputs):
+    slips = []
+    for employee_id, gross, present, total in zip(*inputs):
+        emp_salary = EmployeeSalary(employee_id, gross, present, total, "benchmark")
+        emp_salary.calculate()
+        slips.append((emp_salary, emp_salary.to_dict()))
+    return slips
+
+
+def slotted_objects(inputs):
+    slips = []
+    for employee_id, gross, present, total in zip(*inputs):
+        emp_salary = EmployeeSalary(employee_id, gross, present, total, "benchmark")
+        emp_salary.calculate()
+        slips.append(emp_salary)
+    return slips
+
+
+def slip_batch(inputs):
+    batch = EmployeeSalaryBatch(*inputs, "benchmark")
+    batch.calculate()
+    return batch.to_slip_batch()
+
+
+def slip_frame(inputs):
+    return slip_batch(inputs).to_frame()
+
+
+def measure(build, inputs):
+    # Timed without tracemalloc, which slows allocation-heavy code several-fold.
+    gc.collect()
+    started = time.perf_counter()
+    result = build(inputs)
+    seconds = time.perf_counter() - started
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build(inputs)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held, peak, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100000)
+    args = parser.parse_args()
+
+    inputs = _inputs(args.employees)
+    print(f"{'representation':<32}{'held MiB':>10}{'peak MiB':>10}{'B/slip':>9}{'seconds':>9}")
+    for name, build in (("legacy objects + to_dict", legacy_objects_and_dicts),
+                        ("__slots__ objects + to_dict", slotted_objects_and_dicts),
+                        ("__slots__ objects", slotted_objects),
+                        ("SlipBatch", slip_batch),
+                        ("SlipBatch.to_frame()", slip_frame)):
+        held, peak, seconds = measure(build, inputs)
+        print(f"{name:<32}{held / 2**20:>10.1f}{peak / 2**20:>10.1f}"
+              f"{held / args.employees:>9.0f}{seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
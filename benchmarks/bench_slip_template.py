@@ -0,0 +1,61 @@
+"""Compare per-slip PDF render cost of the classic and template paths.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_slip_template --slips 2000
+"""
+import argparse
+import statistics
+import time
+
+from paypro.batch import EmployeeSalaryBatch
+from paypro.slip_pdf import SalarySlipPDF, get_slip_template
+
+
+def sample_slips(count):
+    batch = EmployeeSalaryBatch(
+        [f"EMP{i:06d}" for i in range(count)],
+        [30000.0 + (i % 500) * 137.5 for i in range(count)],
+        [20 + i % 11 for i in range(count)],
+        [30] * count,
+        "benchmark",
+    )
+    batch.calculate()
+    return batch.to_dicts()
+
+
+def measure(slips, use_template):
+    timings = []
+    total_bytes = 0
+    for slip in slips:
+        started = time.perf_counter()
+        pdf_bytes = SalarySlipPDF(slip, use_template=use_template).generate()
+        timings.append(time.perf_counter() - started)
+        total_bytes += len(pdf_bytes)
+    return {
+        "mean_us": round(statistics.fmean(timings) * 1e6, 1),
+        "p50_us": round(statistics.median(timings) * 1e6, 1),
+        "slips_per_sec": round(len(slips) / sum(timings), 1),
+        "avg_bytes": round(total_bytes / len(slips), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slips", type=int, default=2000)
+    args = parser.parse_args()
+
+    slips = sample_slips(args.slips)
+    get_slip_template()  # compile outside the timed loop
+    classic = measure(slips, use_template=False)
+    template = measure(slips, use_template=True)
+
+    print(f"{'path':<10}{'mean us':>10}{'p50 us':>10}{'slips/s':>10}{'bytes':>10}")
+    for name, result in (("classic", classic), ("template", template)):
+        print(f"{name:<10}{result['mean_us']:>10}{result['p50_us']:>10}"
+              f"{result['slips_per_sec']:>10}{result['avg_bytes']:>10}")
+    print(f"speedup: {classic['mean_us'] / template['mean_us']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-rerun payload and CPU cost of the login background, before and after.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_static_assets --reruns 50
+"""
+import argparse
+import base64
+import os
+import time
+
+from paypro.assets import STATIC_DIR, StaticAssets
+
+
+def inline_background(path):
+    # What UserManager._set_background used to build on every rerun.
+    with open(path, "rb") as image_file:
+        encoded_string = base64.b64encode(image_file.read()).decode()
+    return f"""
+        <style>
+        .stApp {{
+            background-image: url("data:image/jpg;base64,{encoded_string}");
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+        }}
+        </style>
+        """
+
+
+def timed(build, reruns):
+    started = time.perf_counter()
+    for _ in range(reruns):
+        payload = build()
+    return len(payload.encode()), (time.perf_counter() - started) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument("--asset", default="login.jpg")
+    args = parser.parse_args()
+
+    path = os.path.join(STATIC_DIR, args.asset)
+    assets = StaticAssets()
+    before_bytes, before_s = timed(lambda: inline_background(path), args.reruns)
+    after_bytes, after_s = timed(
+        lambda: assets.background_style(assets.url(args.asset), ".stApp"), args.reruns)
+
+    print(f"asset: {args.asset} ({os.path.getsize(path):,} bytes on disk)")
+    print(f"inline base64: {before_bytes:>12,} bytes/rerun  {before_s * 1e3:8.3f} ms/rerun")
+    print(f"cached url:    {after_bytes:>12,} bytes/rerun  {after_s * 1e3:8.3f} ms/rerun")
+    print(f"saved per rerun: {before_bytes - after_bytes:,} bytes, "
+          f"{(before_s - after_s) * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
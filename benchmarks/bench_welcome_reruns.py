@@ -0,0 +1,145 @@
+"""Server load from idle visitors on the welcome page, before and after.
+
+The old clock rendered the time on the server and used st_autorefresh to
+make the browser request a full script rerun every 500 ms.  The new clock
+ticks in the browser and requests none.  This script runs both pages with
+Streamlit's AppTest harness and measures the CPU cost of one rerun of each.
+
+It then simulates one idle session of each for ``--seconds``.  AppTest has
+no browser, so nothing runs st_autorefresh's frontend timer: the harness
+stands in for it, rerunning a page on whatever interval that page passed
+to ``st_autorefresh`` (none for the new page).  Reruns are counted by the
+scripts themselves.  The rerun rate before is therefore modelled on the
+component's interval; the CPU per idle second is measured for both.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_welcome_reruns --runs 30 --seconds 5 --sessions 1 100 500
+"""
+import argparse
+import logging
+import time
+
+from streamlit.testing.v1 import AppTest
+
+# Each script counts its own runs, and the legacy one records the interval
+# it asked st_autorefresh for; idle_session reads both from session state.
+RUNS_KEY = "_bench_script_runs"
+INTERVAL_KEY = "_bench_autorefresh_ms"
+
+CURRENT_SCRIPT = f'''
+import streamlit as st
+
+st.session_state["{RUNS_KEY}"] = st.session_state.get("{RUNS_KEY}", 0) + 1
+
+from main import WelcomePage
+
+WelcomePage().show()
+'''
+
+# The welcome page as it was before the browser-side clock.
+LEGACY_SCRIPT = f'''
+from datetime import datetime
+
+import streamlit as st
+from streamlit_autorefresh import st_autorefresh
+
+st.session_state["{RUNS_KEY}"] = st.session_state.get("{RUNS_KEY}", 0) + 1
+
+from main import WelcomePage
+
+
+class LegacyWelcomePage(WelcomePage):
+    def display_datetime(self):
+        st.session_state["{INTERVAL_KEY}"] = self.refresh_interval_ms
+        st_autorefresh(interval=self.refresh_interval_ms, limit=None, key="timer")
+
+        now = datetime.now()
+        current_time = now.strftime("%I:%M:%S %p")
+        current_day = now.strftime("%A, %B %d, %Y")
+
+        st.markdown(f"""
+        ### 📅 {{current_day}}
+        ### 🕐 {{current_time}}
+        """)
+
+
+LegacyWelcomePage().show()
+'''
+
+
+def current_app():
+    return AppTest.from_string(CURRENT_SCRIPT)
+
+
+def legacy_app():
+    return AppTest.from_string(LEGACY_SCRIPT)
+
+
+def rerun_cost(app, runs):
+    app.run()  # warm imports and caches
+    started_cpu = time.process_time()
+    started_wall = time.perf_counter()
+    for _ in range(runs):
+        app.run()
+    return ((time.process_time() - started_cpu) / runs,
+            (time.perf_counter() - started_wall) / runs)
+
+
+def idle_session(app, seconds):
+    """Reruns/sec, server CPU s/s and the autorefresh interval for one idle tab.
+
+    If the page asked st_autorefresh for an interval, it is rerun on that
+    interval, as the component's browser timer would; otherwise nothing
+    asks for a rerun.  Reruns are the script runs the page counted.
+    """
+    app.run()
+    refresh_interval_ms = None
+    if INTERVAL_KEY in app.session_state:
+        refresh_interval_ms = app.session_state[INTERVAL_KEY]
+    runs_before = app.session_state[RUNS_KEY]
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    deadline = started + seconds
+    next_rerun = started
+    while True:
+        if refresh_interval_ms is None:
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            break
+        next_rerun += refresh_interval_ms / 1000
+        if next_rerun > deadline:
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+            break
+        time.sleep(max(0.0, next_rerun - time.perf_counter()))
+        app.run()
+    elapsed = time.perf_counter() - started
+    reruns = app.session_state[RUNS_KEY] - runs_before
+    return reruns / elapsed, (time.process_time() - started_cpu) / elapsed, refresh_interval_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="length of each simulated idle session")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 100, 500])
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    before_cpu, before_wall = rerun_cost(legacy_app(), args.runs)
+    after_cpu, after_wall = rerun_cost(current_app(), args.runs)
+    print(f"WelcomePage rerun before: {before_cpu * 1e3:.2f} ms CPU, {before_wall * 1e3:.2f} ms wall")
+    print(f"WelcomePage rerun after:  {after_cpu * 1e3:.2f} ms CPU, {after_wall * 1e3:.2f} ms wall")
+
+    before_rate, before_load, before_interval = idle_session(legacy_app(), args.seconds)
+    after_rate, after_load, _ = idle_session(current_app(), args.seconds)
+    print(f"over {args.seconds:g}s idle: reruns/sec before {before_rate:.2f} "
+          f"(modelled: st_autorefresh(interval={before_interval}) timer driven by the harness), "
+          f"after {after_rate:.2f} (no autorefresh requested)")
+    print(f"{'sessions':>10}{'before CPU s/s':>18}{'after CPU s/s':>16}  (measured per session, scaled)")
+    for sessions in args.sessions:
+        print(f"{sessions:>10}{sessions * before_load:>18.3f}{sessions * after_load:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Benchmark suite for the payroll hot paths, with baseline comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.suite run --output bench.json
+    python -m benchmarks.suite run --output bench.json --compare baseline.json
+    python -m benchmarks.suite compare baseline.json bench.json --threshold 0.15
+
+Each case runs at several input sizes (scaled by ``--scale``) and records
+the median and best of ``--repeat`` runs.  ``compare`` flags every case
+whose median got slower than the baseline by more than ``--threshold``
+and exits with status 1 if there is any.
+
+``--backend`` picks where saves go.  The default ``standin`` is an
+in-process connection that accepts every statement, so
+``save_employee_data`` measures only the app-side cost of a save (pool
+checkout, transaction, rollup deltas).  ``sqlite`` and ``mysql`` run the
+same cases against the configured storage backend (see paypro.config);
+``sqlite`` uses a throwaway database file unless PAYPRO_SQLITE_PATH is set.
+``compare`` refuses (status 2) to compare reports from different backends
+unless ``--allow-backend-mismatch`` is given.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from paypro.db import ConnectionPool
+from paypro.salary import EmployeeSalary, SlipIDGenerator
+from paypro.slip_pdf import SalarySlipPDF
+from paypro.storage import EmployeeDataStorageMySQL, create_salary_storage
+
+BACKENDS = ("standin", "sqlite", "mysql")
+
+
+class StandInCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.connection.statements += 1
+        self.rowcount = 1
+        return 1
+
+    def executemany(self, sql, params):
+        params = list(params)
+        self.connection.statements += 1
+        self.rowcount = len(params)
+        return self.rowcount
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class StandInConnection:
+    """Accepts every statement and returns no rows."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.open = True
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        self.open = False
+
+
+class StandInPool(ConnectionPool):
+    def _connect(self):
+        return StandInConnection()
+
+
+def standin_storage():
+    storage = EmployeeDataStorageMySQL()
+    storage.pool = StandInPool()
+    return storage
+
+
+def benchmark_storage():
+    if os.environ.get("PAYPRO_STORAGE"):
+        return create_salary_storage()
+    return standin_storage()
+
+
+def use_backend(backend):
+    """Point paypro.config (and so every page) at ``backend`` for this run."""
+    if backend == "standin":
+        os.environ.pop("PAYPRO_STORAGE", None)
+        return
+    os.environ["PAYPRO_STORAGE"] = backend
+    if backend == "sqlite" and not os.environ.get("PAYPRO_SQLITE_PATH"):
+        os.environ["PAYPRO_SQLITE_PATH"] = os.path.join(
+            tempfile.mkdtemp(prefix="paypro-bench-"), "bench.sqlite3")
+
+
+def _inputs(size):
+    return [(f"EMP{i:06d}", 30000.0 + (i % 500) * 137.5, 20 + i % 11, 30)
+            for i in range(size)]
+
+
+def bench_calculate(size):
+    inputs = _inputs(size)
+    started = time.perf_counter()
+    for employee_id, gross, present, total in inputs:
+        emp_salary = EmployeeSalary(employee_id, gross, present, total, "benchmark")
+        emp_salary.calculate()
+        emp_salary.to_dict()
+    return time.perf_counter() - started
+
+
+def bench_slip_id(size):
+    started = time.perf_counter()
+    for _ in range(size):
+        SlipIDGenerator.generate()
+    return time.perf_counter() - started
+
+
+def _slips(size):
+    slips = []
+    for employee_id, gross, present, total in _inputs(size):
+        emp_salary = EmployeeSalary(employee_id, gross, present, total, "benchmark")
+        emp_salary.calculate()
+        slips.append(emp_salary.to_dict())
+    return slips
+
+
+def bench_slip_pdf(size):
+    slips = _slips(size)
+    started = time.perf_counter()
+    for slip in slips:
+        SalarySlipPDF(slip).generate()
+    return time.perf_counter() - started
+
+
+def bench_save(size):
+    storage = benchmark_storage()
+    slips = _slips(size)
+    started = time.perf_counter()
+    for slip in slips:
+        storage.save_employee_data(slip)
+    return time.perf_counter() - started
+
+
+def bench_page_rerun(size):
+    from streamlit.testing.v1 import AppTest
+    from paypro.write_behind import get_write_behind_queue
+
+    # Claim the process-wide writer first so the page saves to the benchmark backend.
+    get_write_behind_queue(benchmark_storage)
+    app = AppTest.from_file("pages/salary_calculator.py", default_timeout=60)
+    app.session_state["logged_in"] = True
+    app.session_state["username"] = "benchmark"
+    app.run()
+    app.text_input[0].input("EMP000001")
+    app.number_input[0].set_value(50000.0)
+    app.number_input[1].set_value(28)
+    started = time.perf_counter()
+    for _ in range(size):
+        app.button[0].click().run()
+    elapsed = time.perf_counter() - started
+    if app.exception:
+        raise RuntimeError(f"salary page raised: {app.exception}")
+    return elapsed
+
+
+# name -> (function, sizes at --scale 1)
+CASES = {
+    "calculate_to_dict": (bench_calculate, [1000, 10000, 100000]),
+    "slip_id_generate": (bench_slip_id, [1000, 10000, 100000]),
+    "slip_pdf_generate": (bench_slip_pdf, [10, 100, 1000]),
+    "save_employee_data": (bench_save, [100, 1000, 10000]),
+    "salary_page_rerun": (bench_page_rerun, [1, 5, 20]),
+}
+
+
+def run_suite(cases, scale, repeat, backend="standin"):
+    results = {}
+    for name in cases:
+        func, sizes = CASES[name]
+        for size in sorted({max(1, int(size * scale)) for size in sizes}):
+            timings = sorted(func(size) for _ in range(repeat))
+            median = statistics.median(timings)
+            key = f"{name}[{size}]"
+            results[key] = {
+                "case": name,
+                "size": size,
+                "median_s": round(median, 6),
+                "min_s": round(timings[0], 6),
+                "per_op_us": round(median / size * 1e6, 2),
+                "ops_per_sec": round(size / median, 1) if median > 0 else 0.0,
+            }
+            print(f"{key:<32}{results[key]['per_op_us']:>12} us/op"
+                  f"{results[key]['ops_per_sec']:>14} ops/s", flush=True)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend,
+            "scale": scale,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print per-case ratios and return the keys that regressed past ``threshold``."""
+    regressions = []
+    print(f"{'case':<32}{'baseline us':>14}{'current us':>14}{'ratio':>8}")
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:<32}{'-':>14}{result['per_op_us']:>14}{'new':>8}")
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<32}{base['per_op_us']:>14}{result['per_op_us']:>14}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and write a JSON report")
+    run.add_argument("--output", default="bench.json")
+    run.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    run.add_argument("--scale", type=float, default=1.0,
+                     help="multiply every input size, e.g. 0.1 for a quick run")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--backend", choices=BACKENDS, default="standin")
+    run.add_argument("--compare", metavar="BASELINE",
+                     help="compare against this report after running")
+    run.add_argument("--threshold", type=float, default=0.10)
+    run.add_argument("--allow-backend-mismatch", action="store_true",
+                     help="compare even if the baseline used another backend")
+
+    cmp = commands.add_parser("compare", help="compare two JSON reports")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10,
+                     help="allowed slowdown as a fraction of the baseline median")
+    cmp.add_argument("--allow-backend-mismatch", action="store_true",
+                     help="compare reports from different storage backends")
+    args = parser.parse_args()
+
+    # The page's write-behind thread and cache logging are noise here.
+    logging.disable(logging.WARNING)
+
+    if args.command == "run":
+        use_backend(args.backend)
+        report = run_suite(args.cases, args.scale, args.repeat, args.backend)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"wrote {args.output}")
+        if not args.compare:
+            return
+        baseline, current = _load(args.compare), report
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    # Reports written before --backend existed all used the stand-in.
+    backends = [report.get("meta", {}).get("backend", "standin") for report in (baseline, current)]
+    if backends[0] != backends[1]:
+        message = f"baseline used the {backends[0]} backend but current used {backends[1]}"
+        if not args.allow_backend_mismatch:
+            print(f"refusing to compare: {message} (pass --allow-backend-mismatch to override)",
+                  file=sys.stderr)
+            sys.exit(2)
+        print(f"warning: {message}; save timings are not comparable", file=sys.stderr)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,39 @@
 import streamlit as st
-from datetime import datetime
-from streamlit_autorefresh import st_autorefresh
+import streamlit.components.v1 as components
+
+from paypro.assets import static_assets
+from paypro.metrics import page_rerun
+
+# Ticks in the browser; the markup never changes between reruns, so the
+# iframe is kept as-is and no server rerun is needed to advance the clock.
+CLOCK_HTML = """
+<div id="clock">
+    <h3 id="clock-day">📅</h3>
+    <h3 id="clock-time">🕐</h3>
+</div>
+<style>
+    #clock h3 {
+        margin: 0 0 0.6rem 0;
+        color: #fafafa;
+        font-family: "Source Sans Pro", sans-serif;
+        font-size: 1.75rem;
+        font-weight: 600;
+    }
+</style>
+<script>
+    function tick() {
+        const now = new Date();
+        document.getElementById("clock-day").textContent = "📅 " + now.toLocaleDateString(
+            "en-US", {weekday: "long", year: "numeric", month: "long", day: "2-digit"});
+        document.getElementById("clock-time").textContent = "🕐 " + now.toLocaleTimeString(
+            "en-US", {hour: "2-digit", minute: "2-digit", second: "2-digit", hour12: true});
+    }
+    tick();
+    setInterval(tick, %(interval)d);
+</script>
+"""
+
+WELCOME_BACKGROUND_URL = "https://img.freepik.com/premium-photo/currency-exchange-concepts-interbank-payments-use-money-transfer-global-business-fintech-finance-technology-online-banking-online-banking-interbank-payment-concept_35148-11131.jpg?semt=ais_hybrid&w=740"
 
 
 class WelcomePage:
@@ -14,32 +47,16 @@ class WelcomePage:
             st.session_state.logged_in = False
 
     def _set_background(self):
-        page_bg_img = """
-        <style>
-        [data-testid="stAppViewContainer"]{
-            background-image: url("https://img.freepik.com/premium-photo/currency-exchange-concepts-interbank-payments-use-money-transfer-global-business-fintech-finance-technology-online-banking-online-banking-interbank-payment-concept_35148-11131.jpg?semt=ais_hybrid&w=740");
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-        }
-        </style>
-        """
+        page_bg_img = static_assets.background_style(
+            WELCOME_BACKGROUND_URL, '[data-testid="stAppViewContainer"]')
         st.markdown(page_bg_img, unsafe_allow_html=True)
 
     def display_datetime(self):
-       # Auto-refresh the page every refresh_interval_ms milliseconds
-        st_autorefresh(interval=self.refresh_interval_ms,
-                       limit=None, key="timer")
-
-        now = datetime.now()
-        current_time = now.strftime("%I:%M:%S %p")
-        current_day = now.strftime("%A, %B %d, %Y")
-
-        st.markdown(f"""
-        ### 📅 {current_day}
-        ### 🕐 {current_time}
-        """)
+        # The clock updates itself every refresh_interval_ms in the browser
+        components.html(
+            CLOCK_HTML % {"interval": self.refresh_interval_ms}, height=110)
 
+    @page_rerun("welcome")
     def show(self):
         self.display_datetime()
         st.title("WELCOME TO PAYPRO")
@@ -1,58 +1,65 @@
 from datetime import datetime
 import streamlit as st
-import pymysql
-from pymysql.cursors import DictCursor
-import base64
+
+from paypro.assets import static_assets
+from paypro.metrics import page_rerun
+from paypro.passwords import get_password_hasher
+from paypro.username_index import get_username_index
+from paypro.users import create_user_store
 
 
 class UserManager:
-    def __init__(self, host='localhost', user='root', password='root', database='signup_db'):
-        self.connection = pymysql.connect(
+    def __init__(self, host='localhost', user='root', password='root', database='signup_db',
+                 hasher=None, store=None):
+        # MySQL settings are used unless PAYPRO_STORAGE selects SQLite.
+        self.store = store or create_user_store(
             user=user,
             password=password,
-            database=database,
-            cursorclass=DictCursor
+            database=database
         )
+        self.hasher = hasher or get_password_hasher()
+        self.usernames = get_username_index(self.store.load_usernames)
 
     def _set_background(self):
-        
-        with open("static/login.jpg", "rb") as image_file:
-            encoded_string = base64.b64encode(image_file.read()).decode()
-        page_bg_img = f"""
-        <style>
-        .stApp {{
-            background-image: url("data:image/jpg;base64,{encoded_string}");
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-        }}
-        </style>
-        """
+        # Served from static/ with a content-hash URL, so the browser caches
+        # the image instead of receiving it base64-inlined on every rerun.
+        page_bg_img = static_assets.background_style(
+            static_assets.url("login.jpg"), ".stApp")
         st.markdown(page_bg_img, unsafe_allow_html=True)
 
     def username_exists(self, username):
-        with self.connection.cursor() as cursor:
-            cursor.execute(
-                "SELECT id FROM users WHERE username=%s", (username,))
-            return cursor.fetchone() is not None
+        # Fast path only: add_user relies on the UNIQUE constraint, not on this.
+        return self.usernames.exists(username, self.store.username_exists)
 
     def verify_login(self, username, password):
-        with self.connection.cursor() as cursor:
-            cursor.execute(
-                "SELECT password FROM users WHERE username=%s", (username,))
-            row = cursor.fetchone()
-            return row and row['password'] == password
+        row = self.store.get_credentials(username)
+        if row is None:
+            return self.hasher.dummy_verify(password)
+        if not self.hasher.verify(password, row['password']):
+            return False
+        if self.hasher.needs_rehash(row['password']):
+            # Upgrades legacy plain-text rows and hashes made with an older
+            # work factor.
+            self.store.update_password(
+                row['id'], row['password'], self.hasher.hash(password))
+        return True
 
     def add_user(self, fullname, phone, dob, email, username, password):
-        with self.connection.cursor() as cursor:
-            cursor.execute(
-                "INSERT INTO users (fullname, phone, dob, email, username, password) VALUES (%s, %s, %s, %s, %s, %s)",
-                (fullname, phone, dob.strftime("%Y-%m-%d"), email, username, password)
-            )
-            self.connection.commit()
+        """Insert the user in one round trip; False if the username is already taken."""
+        added = self.store.insert_user(
+            fullname, phone, dob, email, username, self.hasher.hash(password))
+        self.usernames.add(username)
+        return added
+
+    def pool_stats(self):
+        return self.store.pool_stats()
+
+    def username_index_stats(self):
+        return self.usernames.stats()
 
     def close(self):
-        self.connection.close()
+        # Connections belong to the shared pool and outlive this instance.
+        pass
 
 
 class AuthApp:
@@ -61,6 +68,7 @@ class AuthApp:
         st.session_state.setdefault("mode", "Login")
         st.session_state.setdefault("logged_in", False)
 
+    @page_rerun("auth")
     def run(self):
         self.user_manager._set_background()
         st.title("Login / Sign Up")
@@ -106,10 +114,10 @@ class AuthApp:
                     st.error("Username already exists. Please choose another.")
                 elif not gmail.lower().endswith("@gmail.com"):
                     st.error("Please enter a valid Gmail address.")
+                elif not self.user_manager.add_user(
+                        capatilized_name, phone_no, dob, gmail, new_username, new_password):
+                    st.error("Username already exists. Please choose another.")
                 else:
-                    self.user_manager.add_user(
-                        capatilized_name, phone_no, dob, gmail, new_username, new_password
-                    )
                     st.success(
                         "Account created successfully! You can now log in.")
                     st.session_state.mode = "Login"
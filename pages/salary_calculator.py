@@ -1,112 +1,15 @@
 import streamlit as st
 from datetime import datetime
-import random
-import pymysql
-from pymysql.cursors import DictCursor
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 
-
-class SlipIDGenerator:
-    @staticmethod
-    def generate():
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        random_num = random.randint(1000, 9999)
-        return f"SLIP-{timestamp}-{random_num}"
-
-
-class EmployeeSalary:
-    def __init__(self, employee_id, gross_salary, present_days,
-                 total_days, username,):
-        self.employee_id = employee_id
-        self.gross_salary = gross_salary
-        self.present_days = present_days
-        self.total_days = total_days
-        self.username = username
-        self.calculation_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.slip_id = SlipIDGenerator.generate()
-
-        self.proportional_salary = None
-        self.pf = None
-        self.hra = None
-        self.tax = None
-        self.da = None
-        self.medical_insurance = 1000  # fixed
-        self.transport_allowance = None
-        self.bonus = None
-        self.attendance_pct = None
-        self.total_deductions = None
-        self.take_home = None
-
-    def calculate(self):
-        self.proportional_salary = (
-            self.gross_salary * self.present_days) / self.total_days
-        self.pf = self.proportional_salary * 0.12
-        self.hra = self.proportional_salary * 0.10
-        self.tax = self.proportional_salary * 0.15
-        self.da = self.proportional_salary * 0.08
-        self.transport_allowance = self.proportional_salary * 0.02
-        self.attendance_pct = (self.present_days / self.total_days) * 100
-        self.bonus = self.proportional_salary * 0.05 if self.attendance_pct >= 75 else 0
-        self.total_deductions = self.pf + self.tax
-        self.take_home = self.proportional_salary - self.total_deductions + self.bonus
-
-    def to_dict(self):
-        return {
-            "slip_id": self.slip_id,
-            "employee_id": self.employee_id,
-            "username": self.username,
-            "calculation_date": self.calculation_date,
-            "present_days": self.present_days,
-            "total_days": self.total_days,
-            "gross_salary": round(self.gross_salary, 2),
-            "proportional_salary": round(self.proportional_salary, 2),
-            "pf_deduction": round(self.pf, 2),
-            "tax_deduction": round(self.tax, 2),
-            "hra": round(self.hra, 2),
-            "da": round(self.da, 2),
-            "medical_insurance": round(self.medical_insurance, 2),
-            "transport_allowance": round(self.transport_allowance, 2),
-            "bonus": round(self.bonus, 2),
-            "attendance_percentage": round(self.attendance_pct, 2),
-            "total_deductions": round(self.total_deductions, 2),
-            "take_home_salary": round(self.take_home, 2),
-        }
-
-
-class EmployeeDataStorageMySQL:
-    def __init__(self, host='localhost', user="root", password='root', database='employee_salary_data_db'):
-        self.connection = pymysql.connect(
-            host='localhost',
-            user='root',
-            password='root',
-            database='employee_salary_data_db',
-            cursorclass=DictCursor,
-            autocommit=True
-        )
-
-    def save_employee_data(self, employee_data: dict):
-        with self.connection.cursor() as cursor:
-            sql = """
-            INSERT  INTO salary_slips (
-                slip_id, employee_id, username, calculation_date,
-                present_days, total_days, gross_salary, proportional_salary,
-                pf_deduction, tax_deduction, hra, da, medical_insurance,
-                transport_allowance, bonus, attendance_percentage,
-                total_deductions, take_home_salary
-            ) VALUES (
-                %(slip_id)s, %(employee_id)s, %(username)s, %(calculation_date)s,
-                %(present_days)s, %(total_days)s, %(gross_salary)s, %(proportional_salary)s,
-                %(pf_deduction)s, %(tax_deduction)s, %(hra)s, %(da)s, %(medical_insurance)s,
-                %(transport_allowance)s, %(bonus)s, %(attendance_percentage)s,
-                %(total_deductions)s, %(take_home_salary)s
-            )
-            """
-            cursor.execute(sql, employee_data)
-
-    def close(self):
-        self.connection.close()
+from paypro.chart_cache import get_breakdown_views
+from paypro.metrics import page_rerun
+from paypro.rules import load_rule_set
+from paypro.salary import EmployeeSalary
+from paypro.storage import create_salary_storage
+from paypro.write_behind import get_write_behind_queue, WriteBehindFullError
 
 
 class SalaryCalculatorApp:
@@ -114,13 +17,10 @@ class SalaryCalculatorApp:
         self.username = st.session_state.get("username", "User")
         self.logged_in = st.session_state.get("logged_in", False)
         self.salary_slip_data = None
-        # Initialize MySQL storage (update credentials accordingly)
-        self.storage = EmployeeDataStorageMySQL(
-            host='localhost',
-            user='admin',
-            password='password',
-            database='employee_salary_data_db'
-        )
+        self.rules = load_rule_set()
+        # Slips are only enqueued here; the queue owns the one storage
+        # connection (PAYPRO_STORAGE picks the backend).
+        self.writer = get_write_behind_queue(create_salary_storage)
 
     def add_custom_css(self):
         st.markdown("""
@@ -273,7 +173,7 @@ class SalaryCalculatorApp:
                 if attendance_pct >= 90:
                     status_color = "green"
                     status_text = "Excellent"
-                elif attendance_pct >= 75:
+                elif attendance_pct >= self.rules.bonus_attendance_threshold:
                     status_color = "orange"
                     status_text = "Good"
                 else:
@@ -285,7 +185,7 @@ class SalaryCalculatorApp:
                     <strong>📊 Attendance Status:</strong>
                     <span style="color: {status_color}; font-weight: bold;">{attendance_pct:.1f}% ({status_text})</span>
                     <br>
-                    <small>💡 Tip: Maintain >75% attendance for bonus eligibility!</small>
+                    <small>💡 Tip: Maintain >{self.rules.bonus_attendance_threshold:g}% attendance for bonus eligibility!</small>
                 </div>
                 """, unsafe_allow_html=True)
 
@@ -311,9 +211,10 @@ class SalaryCalculatorApp:
 
     def create_salary_breakdown_chart(self, emp_salary):
         # Create a pie chart for salary breakdown
-        labels = ['Take Home', 'PF Deduction', 'Tax Deduction']
-        values = [emp_salary.take_home, emp_salary.pf, emp_salary.tax]
-        colors = ['#28a745', '#dc3545', '#ffc107']
+        deductions = self.rules.deductions()
+        labels = ['Take Home'] + [f"{c.short_label} Deduction" for c in deductions]
+        values = [float(emp_salary.take_home)] + [float(getattr(emp_salary, c.key)) for c in deductions]
+        colors = ['#28a745', '#dc3545', '#ffc107', '#fd7e14', '#6f42c1'][:len(values)]
 
         fig = go.Figure(data=[go.Pie(
             labels=labels,
@@ -350,12 +251,13 @@ class SalaryCalculatorApp:
 
     def create_allowances_chart(self, emp_salary):
         # Create a bar chart for allowances and deductions
-        categories = ['HRA', 'DA', 'Transport',
-                      'Medical', 'Bonus', 'PF', 'Tax']
-        values = [emp_salary.hra, emp_salary.da, emp_salary.transport_allowance,
-                  emp_salary.medical_insurance, emp_salary.bonus, -emp_salary.pf, -emp_salary.tax]
-        colors = ['#28a745', '#28a745', '#28a745',
-                  '#17a2b8', '#ffc107', '#dc3545', '#dc3545']
+        kind_colors = {'allowance': '#28a745', 'insurance': '#17a2b8',
+                       'incentive': '#ffc107', 'deduction': '#dc3545'}
+        components = self.rules.earnings() + self.rules.deductions()
+        categories = [c.short_label for c in components]
+        values = [-float(getattr(emp_salary, c.key)) if c.kind == 'deduction'
+                  else float(getattr(emp_salary, c.key)) for c in components]
+        colors = [kind_colors[c.kind] for c in components]
 
         fig = go.Figure(data=[go.Bar(
             x=categories,
@@ -400,7 +302,7 @@ class SalaryCalculatorApp:
             st.metric(
                 label="📊 Attendance",
                 value=f"{emp_salary.attendance_pct:.1f}%",
-                delta="Good" if emp_salary.attendance_pct >= 75 else "Needs Improvement"
+                delta="Good" if emp_salary.attendance_pct >= self.rules.bonus_attendance_threshold else "Needs Improvement"
             )
 
         with col3:
@@ -411,14 +313,66 @@ class SalaryCalculatorApp:
             )
 
         with col4:
+            allowances = [c for c in self.rules.earnings() if c.kind == 'allowance']
+            rates = [c.rate for c in allowances if c.rate is not None]
             st.metric(
-                label="🏠 HRA + DA",
-                value=f"₹{emp_salary.hra + emp_salary.da:,.0f}",
-                delta=f"18% of gross"
+                label="🏠 " + (" + ".join(c.short_label for c in allowances) or "Allowances"),
+                value=f"₹{sum(getattr(emp_salary, c.key) for c in allowances):,.0f}",
+                delta=f"{sum(rates) * 100:g}% of gross" if rates else None
             )
 
+    def create_details_table(self, emp_salary):
+        earnings = self.rules.earnings()
+        deductions = self.rules.deductions()
+        data = {
+            "Component": ["Gross Salary", "Proportional Salary"]
+            + [c.display_label for c in earnings + deductions] + ["Take Home"],
+            "Amount (₹)": [
+                f"{emp_salary.gross_salary:,.2f}",
+                f"{emp_salary.proportional_salary:,.2f}"
+            ] + [f"{getattr(emp_salary, c.key):,.2f}" for c in earnings]
+            + [f"-{getattr(emp_salary, c.key):,.2f}" for c in deductions]
+            + [f"{emp_salary.take_home:,.2f}"],
+            "Type": ["Base", "Calculated"]
+            + [c.kind.title() for c in earnings + deductions] + ["Final"]
+        }
+        return pd.DataFrame(data)
+
+    def create_slip_preview_tables(self, emp_salary):
+        earnings = self.rules.earnings()
+        deductions = self.rules.deductions()
+        earnings_data = {
+            "Component": ["Proportional Salary"] + [c.display_label for c in earnings],
+            "Amount (₹)": [f"{emp_salary.proportional_salary:,.2f}"]
+            + [f"{getattr(emp_salary, c.key):,.2f}" for c in earnings]
+        }
+
+        deductions_data = {
+            "Component": [c.display_label for c in deductions],
+            "Amount (₹)": [f"{getattr(emp_salary, c.key):,.2f}" for c in deductions]
+        }
+        return pd.DataFrame(earnings_data), pd.DataFrame(deductions_data)
+
+    def build_breakdown_views(self, emp_salary):
+        earnings_df, deductions_df = self.create_slip_preview_tables(emp_salary)
+        return {
+            "distribution": self.create_salary_breakdown_chart(emp_salary),
+            "components": self.create_allowances_chart(emp_salary),
+            "details": self.create_details_table(emp_salary),
+            "earnings": earnings_df,
+            "deductions": deductions_df,
+        }
+
+    def breakdown_views(self, emp_salary):
+        # Figures and tables depend only on the slip's numbers, so reruns for
+        # the same slip reuse the prebuilt objects.
+        return get_breakdown_views(
+            emp_salary, lambda: self.build_breakdown_views(emp_salary),
+            self.rules.fingerprint)
+
     def display_interactive_breakdown(self, emp_salary):
         st.markdown("### 📊 Interactive Salary Analysis")
+        views = self.breakdown_views(emp_salary)
 
         # Create tabs for different views
         tab1, tab2, tab3 = st.tabs(
@@ -427,45 +381,23 @@ class SalaryCalculatorApp:
         with tab1:
             col1, col2 = st.columns(2)
             with col1:
-                st.plotly_chart(self.create_salary_breakdown_chart(
-                    emp_salary), use_container_width=True)
+                st.plotly_chart(views["distribution"],
+                                use_container_width=True)
             with col2:
                 st.markdown("#### 💡 Key Insights")
                 st.markdown(f"""
                 - **Effective Salary Rate**: ₹{emp_salary.take_home/emp_salary.present_days:,.0f} per day
                 - **Deduction Percentage**: {(emp_salary.total_deductions/emp_salary.proportional_salary)*100:.1f}%
-                - **Bonus Eligibility**: {'✅ Eligible' if emp_salary.attendance_pct >= 75 else '❌ Not Eligible'}
+                - **Bonus Eligibility**: {'✅ Eligible' if emp_salary.attendance_pct >= self.rules.bonus_attendance_threshold else '❌ Not Eligible'}
                 - **Attendance Impact**: {emp_salary.attendance_pct:.1f}% attendance
                 """)
 
         with tab2:
-            st.plotly_chart(self.create_allowances_chart(
-                emp_salary), use_container_width=True)
+            st.plotly_chart(views["components"], use_container_width=True)
 
         with tab3:
             # Detailed breakdown table
-            data = {
-                "Component": ["Gross Salary", "Proportional Salary", "HRA (10%)", "DA (8%)",
-                              "Transport (2%)", "Medical Insurance", "Bonus (5%)", "PF (12%)",
-                              "Tax (15%)", "Take Home"],
-                "Amount (₹)": [
-                    f"{emp_salary.gross_salary:,.2f}",
-                    f"{emp_salary.proportional_salary:,.2f}",
-                    f"{emp_salary.hra:,.2f}",
-                    f"{emp_salary.da:,.2f}",
-                    f"{emp_salary.transport_allowance:,.2f}",
-                    f"{emp_salary.medical_insurance:,.2f}",
-                    f"{emp_salary.bonus:,.2f}",
-                    f"-{emp_salary.pf:,.2f}",
-                    f"-{emp_salary.tax:,.2f}",
-                    f"{emp_salary.take_home:,.2f}"
-                ],
-                "Type": ["Base", "Calculated", "Allowance", "Allowance", "Allowance",
-                         "Insurance", "Incentive", "Deduction", "Deduction", "Final"]
-            }
-
-            df = pd.DataFrame(data)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(views["details"], use_container_width=True)
 
     def display_salary_slip_preview(self, emp_salary):
         with st.expander("📄 View Salary Slip Preview", expanded=False):
@@ -497,37 +429,16 @@ class SalaryCalculatorApp:
 
             st.markdown("---")
 
-            # Create earnings and deductions data
-            earnings_data = {
-                "Component": ["Proportional Salary", "HRA (10%)", "DA (8%)", "Transport Allowance (2%)", "Medical Insurance", "Bonus (5%)"],
-                "Amount (₹)": [
-                    f"{emp_salary.proportional_salary:,.2f}",
-                    f"{emp_salary.hra:,.2f}",
-                    f"{emp_salary.da:,.2f}",
-                    f"{emp_salary.transport_allowance:,.2f}",
-                    f"{emp_salary.medical_insurance:,.2f}",
-                    f"{emp_salary.bonus:,.2f}"
-                ]
-            }
-
-            deductions_data = {
-                "Component": ["PF (12%)", "Tax (15%)"],
-                "Amount (₹)": [
-                    f"{emp_salary.pf:,.2f}",
-                    f"{emp_salary.tax:,.2f}"
-                ]
-            }
+            views = self.breakdown_views(emp_salary)
 
             # Display earnings table
             st.markdown("### 💰 **EARNINGS**")
-            earnings_df = pd.DataFrame(earnings_data)
-            st.dataframe(earnings_df, use_container_width=True,
+            st.dataframe(views["earnings"], use_container_width=True,
                          hide_index=True)
 
             # Display deductions table
             st.markdown("### 💸 **DEDUCTIONS**")
-            deductions_df = pd.DataFrame(deductions_data)
-            st.dataframe(deductions_df, use_container_width=True,
+            st.dataframe(views["deductions"], use_container_width=True,
                          hide_index=True)
 
             # Net pay
@@ -539,6 +450,16 @@ class SalaryCalculatorApp:
             </div>
             """, unsafe_allow_html=True)
 
+    def display_save_failures(self):
+        # Slips this session queued that the background writer gave up on.
+        failed = self.writer.failed_slip_ids(st.session_state.get('queued_slip_ids', []))
+        if failed:
+            st.error(
+                f"⚠️ {len(failed)} of your salary slips could not be saved to the database "
+                f"after retrying ({', '.join(failed)}). They were kept for replay in "
+                f"{self.writer.dead_letter_path}.")
+
+    @page_rerun("salary_calculator")
     def salary_page(self):
         if not self.logged_in:
             st.switch_page("main.py")
@@ -548,6 +469,7 @@ class SalaryCalculatorApp:
 
         # Display header
         self.display_header()
+        self.display_save_failures()
 
         # Create form
         with st.form("salary_form", clear_on_submit=False):
@@ -562,18 +484,23 @@ class SalaryCalculatorApp:
                 with st.spinner("🔄 Calculating your salary..."):
                     emp_salary = EmployeeSalary(
                         employee_id, gross_salary, present_days, total_days, self.username)
-                    emp_salary.calculate()
+                    emp_salary.calculate(self.rules)
+
+                    self.salary_slip_data = emp_salary.to_dict()
 
-                    # Save to MySQL
+                    # Hand the slip to the background writer; MySQL latency
+                    # never reaches the page.
                     try:
-                        self.storage.save_employee_data(emp_salary.to_dict())
+                        self.writer.enqueue(self.salary_slip_data)
+                        queued = st.session_state.setdefault('queued_slip_ids', [])
+                        queued.append(emp_salary.slip_id)
+                        del queued[:-100]
                         st.success(
-                            "✅ Salary calculated and saved successfully!")
-                    except Exception as e:
+                            "✅ Salary calculated and queued for saving!")
+                    except WriteBehindFullError as e:
                         st.warning(
                             f"⚠️ Salary calculated but couldn't save to database: {str(e)}")
 
-                    self.salary_slip_data = emp_salary.to_dict()
                     st.session_state['salary_slip_data'] = self.salary_slip_data
 
                     # Display results
@@ -596,16 +523,13 @@ class SalaryCalculatorApp:
 
         with col3:
             if st.button("📊 View History", use_container_width=True):
-                st.info("📋 Feature coming soon!")
+                st.switch_page("pages/salary_history.py")
 
         with col4:
             if st.button("🚪 Logout", use_container_width=True):
                 st.session_state.clear()
                 st.rerun()
 
-    def close(self):
-        self.storage.close()
-
 
 if __name__ == "__main__":
     app = SalaryCalculatorApp()
@@ -0,0 +1,125 @@
+import streamlit as st
+import pandas as pd
+
+from paypro.metrics import page_rerun
+from paypro.storage import create_salary_storage
+
+
+class SalaryHistoryApp:
+    PAGE_SIZE = 20
+
+    def __init__(self):
+        self.username = st.session_state.get("username", "User")
+        self.logged_in = st.session_state.get("logged_in", False)
+        self.storage = create_salary_storage()
+        # Stack of keyset cursors; the last entry is the page being shown.
+        st.session_state.setdefault("history_cursors", [None])
+        st.session_state.setdefault("history_employee_id", "")
+
+    def add_custom_css(self):
+        st.markdown("""
+        <style>
+        .main-header {
+            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+            padding: 2rem;
+            border-radius: 10px;
+            text-align: center;
+            color: white;
+            margin-bottom: 2rem;
+        }
+
+        .stButton > button {
+            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            border: none;
+            border-radius: 8px;
+            padding: 0.5rem 1rem;
+            font-weight: bold;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+
+    def display_header(self):
+        st.markdown(f"""
+        <div class="main-header">
+            <h1>📊 Salary History</h1>
+            <p>All salary slips calculated by <strong>{self.username}</strong>, newest first.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    def employee_filter(self):
+        employee_id = st.text_input(
+            "👤 Filter by Employee ID",
+            value=st.session_state.history_employee_id,
+            placeholder="Leave empty for all employees"
+        ).strip()
+        if employee_id != st.session_state.history_employee_id:
+            # A new filter starts again from the first page.
+            st.session_state.history_employee_id = employee_id
+            st.session_state.history_cursors = [None]
+        return employee_id
+
+    def display_page(self, rows):
+        if not rows:
+            st.info("📋 No salary slips found yet. Calculate a salary to start your history.")
+            return
+
+        df = pd.DataFrame(rows).rename(columns={
+            "slip_id": "Slip ID",
+            "employee_id": "Employee ID",
+            "calculation_date": "Calculated On",
+            "present_days": "Present Days",
+            "total_days": "Total Days",
+            "gross_salary": "Gross (₹)",
+            "bonus": "Bonus (₹)",
+            "total_deductions": "Deductions (₹)",
+            "take_home_salary": "Take Home (₹)",
+            "attendance_percentage": "Attendance (%)",
+        })
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+    @page_rerun("salary_history")
+    def history_page(self):
+        if not self.logged_in:
+            st.switch_page("main.py")
+
+        self.add_custom_css()
+        self.display_header()
+
+        employee_id = self.employee_filter()
+        cursors = st.session_state.history_cursors
+
+        try:
+            rows, next_cursor = self.storage.fetch_salary_history(
+                self.username, employee_id or None, cursors[-1], self.PAGE_SIZE)
+        except Exception as e:
+            st.error(f"⚠️ Couldn't load salary history: {str(e)}")
+            rows, next_cursor = [], None
+
+        self.display_page(rows)
+        st.caption(f"Page {len(cursors)}")
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            if st.button("⬅️ Newer", use_container_width=True, disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+
+        with col2:
+            if st.button("Older ➡️", use_container_width=True, disabled=next_cursor is None):
+                cursors.append(next_cursor)
+                st.rerun()
+
+        with col3:
+            if st.button("📈 Trends", use_container_width=True):
+                st.switch_page("pages/salary_trends.py")
+
+        with col4:
+            if st.button("← Back to Calculator", use_container_width=True):
+                st.switch_page("pages/salary_calculator.py")
+
+
+if __name__ == "__main__":
+    app = SalaryHistoryApp()
+    app.history_page()
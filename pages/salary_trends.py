@@ -0,0 +1,96 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from paypro.metrics import page_rerun
+from paypro.rules import load_rule_set
+from paypro.storage import create_salary_storage
+
+
+class SalaryTrendsApp:
+    MONTHS = 24
+
+    def __init__(self):
+        self.username = st.session_state.get("username", "User")
+        self.logged_in = st.session_state.get("logged_in", False)
+        self.storage = create_salary_storage()
+
+    def display_header(self):
+        st.markdown(f"""
+        <div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 2rem; border-radius: 10px; text-align: center; color: white; margin-bottom: 2rem;">
+            <h1>📈 Salary Trends</h1>
+            <p>Monthly take-home, deductions, bonus and attendance for <strong>{self.username}</strong>.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    def create_trend_chart(self, df):
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=df["month"], y=df["take_home_total"],
+                                 mode="lines+markers", name="Take Home",
+                                 line=dict(color="#28a745")))
+        fig.add_trace(go.Scatter(x=df["month"], y=df["deductions_total"],
+                                 mode="lines+markers", name="Deductions",
+                                 line=dict(color="#dc3545")))
+        fig.add_trace(go.Bar(x=df["month"], y=df["bonus_total"],
+                             name="Bonus", marker_color="#ffc107", opacity=0.6))
+        fig.update_layout(
+            title={'text': "💰 Monthly Salary Trend", 'x': 0.5, 'xanchor': 'center',
+                   'font': {'size': 18, 'color': 'white'}},
+            xaxis_title="Month",
+            yaxis_title="Amount (₹)",
+            legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5),
+            margin=dict(t=80, b=80, l=50, r=50),
+            height=420
+        )
+        return fig
+
+    def create_attendance_chart(self, df):
+        fig = go.Figure(data=[go.Scatter(
+            x=df["month"], y=df["attendance_avg"], mode="lines+markers",
+            line=dict(color="#17a2b8"), name="Attendance")])
+        fig.add_hline(y=load_rule_set().bonus_attendance_threshold, line_dash="dash", line_color="#ffc107",
+                      annotation_text="Bonus threshold")
+        fig.update_layout(
+            title={'text': "📊 Average Attendance", 'x': 0.5, 'xanchor': 'center',
+                   'font': {'size': 18, 'color': 'white'}},
+            xaxis_title="Month",
+            yaxis_title="Attendance (%)",
+            margin=dict(t=80, b=50, l=50, r=50),
+            height=320
+        )
+        return fig
+
+    @page_rerun("salary_trends")
+    def trends_page(self):
+        if not self.logged_in:
+            st.switch_page("main.py")
+
+        self.display_header()
+
+        try:
+            employees = self.storage.fetch_rollup_employees(self.username)
+        except Exception as e:
+            st.error(f"⚠️ Couldn't load salary trends: {str(e)}")
+            employees = []
+
+        if not employees:
+            st.info("📋 No monthly data yet. Calculate a salary to start your trends.")
+        else:
+            employee_id = st.selectbox("👤 Employee ID", employees)
+            rows = self.storage.fetch_monthly_trend(
+                self.username, employee_id, self.MONTHS)
+            # Rollup rows come back newest first; charts read left to right.
+            df = pd.DataFrame(rows[::-1]).astype({
+                "take_home_total": float, "deductions_total": float,
+                "bonus_total": float, "attendance_avg": float})
+
+            st.plotly_chart(self.create_trend_chart(df), use_container_width=True)
+            st.plotly_chart(self.create_attendance_chart(df), use_container_width=True)
+
+        if st.button("← Back to History"):
+            st.switch_page("pages/salary_history.py")
+
+
+if __name__ == "__main__":
+    app = SalaryTrendsApp()
+    app.trends_page()
@@ -1,87 +1,10 @@
 import streamlit as st
-from fpdf import FPDF
 from datetime import datetime
 
-
-class SalarySlipPDF:
-    """Generates a professional PDF salary slip."""
-
-    def __init__(self, slip_data):
-        self.slip_data = slip_data
-        self.pdf = FPDF()
-        self.pdf.add_page()
-        self.pdf.set_font("Arial", size=12)
-
-    def add_header(self):
-        self.pdf.set_font("Arial", "B", 16)
-        self.pdf.cell(0, 15, "SALARY SLIP", ln=True, align='C')
-        self.pdf.ln(5)
-
-    def add_employee_info(self):
-        self.pdf.set_font("Arial", "B", 12)
-        self.pdf.cell(0, 10, "EMPLOYEE DETAILS", ln=True)
-        self.pdf.set_font("Arial", size=10)
-
-        details = [
-            f"Slip ID: {self.slip_data.get('slip_id', 'N/A')}",
-            f"Employee ID: {self.slip_data.get('employee_id', 'N/A')}",
-            f"Employee Name: {self.slip_data.get('username', 'N/A')}",
-            f"Date: {self.slip_data.get('calculation_date', 'N/A')}",
-            f"Present Days: {self.slip_data.get('present_days', 0)}/{self.slip_data.get('total_days', 0)}"
-        ]
-
-        for detail in details:
-            self.pdf.cell(0, 8, detail, ln=True)
-        self.pdf.ln(5)
-
-    def add_earnings(self):
-        self.pdf.set_font("Arial", "B", 12)
-        self.pdf.cell(0, 10, "EARNINGS", ln=True)
-        self.pdf.set_font("Arial", size=10)
-
-        earnings = [
-            ("Proportional Salary", self.slip_data.get('proportional_salary', 0)),
-            ("HRA (10%)", self.slip_data.get('hra', 0)),
-            ("DA (8%)", self.slip_data.get('da', 0)),
-            ("Medical Insurance", self.slip_data.get('medical_insurance', 0)),
-            ("Transport Allowance (2%)", self.slip_data.get('transport_allowance', 0)),
-            ("Bonus (5%)", self.slip_data.get('bonus', 0))
-        ]
-
-        for label, amount in earnings:
-            self.pdf.cell(100, 8, label, 0, 0)
-            self.pdf.cell(0, 8, f"Rs. {amount:,.2f}", ln=True, align='R')
-        self.pdf.ln(5)
-
-    def add_deductions(self):
-        self.pdf.set_font("Arial", "B", 12)
-        self.pdf.cell(0, 10, "DEDUCTIONS", ln=True)
-        self.pdf.set_font("Arial", size=10)
-
-        deductions = [
-            ("PF (12%)", self.slip_data.get('pf_deduction', 0)),
-            ("Tax (15%)", self.slip_data.get('tax_deduction', 0)),
-            ("Total Deductions", self.slip_data.get('total_deductions', 0))
-        ]
-
-        for label, amount in deductions:
-            self.pdf.cell(100, 8, label, 0, 0)
-            self.pdf.cell(0, 8, f"Rs. {amount:,.2f}", ln=True, align='R')
-        self.pdf.ln(5)
-
-    def add_net_pay(self):
-        self.pdf.set_font("Arial", "B", 14)
-        self.pdf.cell(100, 12, "NET PAY", 0, 0)
-        self.pdf.cell(
-            0, 12, f"Rs. {self.slip_data.get('take_home_salary', 0):,.2f}", ln=True, align='R')
-
-    def generate(self):
-        self.add_header()
-        self.add_employee_info()
-        self.add_earnings()
-        self.add_deductions()
-        self.add_net_pay()
-        return self.pdf.output(dest='S').encode('latin1')
+from paypro.metrics import page_rerun
+from paypro.pdf_cache import get_slip_pdf
+from paypro.rules import load_rule_set
+from paypro.slip_pdf import SalarySlipPDF
 
 
 class SlipGeneratorApp:
@@ -89,6 +12,7 @@ class SlipGeneratorApp:
 
     def __init__(self):
         self.slip_data = st.session_state.get('salary_slip_data')
+        self.rules = load_rule_set()
 
     def add_styles(self):
         st.markdown("""
@@ -438,13 +362,9 @@ class SlipGeneratorApp:
             <div class="info-grid">
         """, unsafe_allow_html=True)
 
-        earnings = [
-            ("Proportional Salary", slip.get('proportional_salary', 0)),
-            ("HRA (10%)", slip.get('hra', 0)),
-            ("DA (8%)", slip.get('da', 0)),
-            ("Medical Insurance", slip.get('medical_insurance', 0)),
-            ("Transport Allowance (2%)", slip.get('transport_allowance', 0)),
-            ("Bonus (5%)", slip.get('bonus', 0))
+        earnings = [("Proportional Salary", slip.get('proportional_salary', 0))] + [
+            (component.display_label, slip.get(component.field, 0))
+            for component in self.rules.earnings()
         ]
 
         for label, amount in earnings:
@@ -465,10 +385,9 @@ class SlipGeneratorApp:
         """, unsafe_allow_html=True)
 
         deductions = [
-            ("PF (12%)", slip.get('pf_deduction', 0)),
-            ("Tax (15%)", slip.get('tax_deduction', 0)),
-            ("Total Deductions", slip.get('total_deductions', 0))
-        ]
+            (component.display_label, slip.get(component.field, 0))
+            for component in self.rules.deductions()
+        ] + [("Total Deductions", slip.get('total_deductions', 0))]
 
         for label, amount in deductions:
             st.markdown(f"""
@@ -496,7 +415,10 @@ class SlipGeneratorApp:
         col1, col2 = st.columns(2)
 
         with col1:
-            pdf_bytes = SalarySlipPDF(slip).generate()
+            # download_button needs the bytes up front, so reruns reuse the
+            # cached render instead of rebuilding the PDF each time.
+            pdf_bytes = get_slip_pdf(
+                slip, lambda: SalarySlipPDF(slip).generate())
             st.download_button(
                 label="📥 Download PDF",
                 data=pdf_bytes,
@@ -510,6 +432,7 @@ class SlipGeneratorApp:
 
         st.markdown("</div></div>", unsafe_allow_html=True)
 
+    @page_rerun("slip_generator")
     def show(self):
         self.check_auth()
         self.add_styles()
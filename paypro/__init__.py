@@ -0,0 +1 @@
+"""Streamlit-free payroll core shared by the pages and batch tooling."""
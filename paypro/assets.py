@@ -0,0 +1,76 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import threading
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+# Where Streamlit serves STATIC_DIR when server.enableStaticServing is on.
+STATIC_URL_PREFIX = "app/static"
+
+
+class StaticAssets:
+    """Process-wide cache of the files in ``static/``.
+
+    Page scripts rerun on every interaction, but this object lives in an
+    imported module, so each file is read and hashed once per process.
+    ``url`` returns a content-hashed URL (``?v=<sha256 prefix>``).  Streamlit's
+    static handler serves those with a far-future Cache-Control header, so the
+    browser downloads the image once instead of receiving it inline on every
+    rerun.
+    """
+
+    def __init__(self, static_dir=STATIC_DIR, url_prefix=STATIC_URL_PREFIX):
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix
+        self._digests = {}
+        self._data_uris = {}
+        self._styles = {}
+        self._lock = threading.Lock()
+
+    def _read(self, name):
+        with open(os.path.join(self.static_dir, name), "rb") as handle:
+            return handle.read()
+
+    def digest(self, name):
+        digest = self._digests.get(name)
+        if digest is None:
+            digest = hashlib.sha256(self._read(name)).hexdigest()[:12]
+            with self._lock:
+                self._digests[name] = digest
+        return digest
+
+    def url(self, name):
+        return f"{self.url_prefix}/{name}?v={self.digest(name)}"
+
+    def data_uri(self, name):
+        """Inline ``data:`` URI, encoded once; only for clients that can't fetch static files."""
+        uri = self._data_uris.get(name)
+        if uri is None:
+            mime = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            uri = f"data:{mime};base64,{base64.b64encode(self._read(name)).decode()}"
+            with self._lock:
+                self._data_uris[name] = uri
+        return uri
+
+    def background_style(self, image_url, selector=".stApp"):
+        """The ``<style>`` block both pages use for a full-page background image."""
+        key = (image_url, selector)
+        style = self._styles.get(key)
+        if style is None:
+            style = f"""
+        <style>
+        {selector}{{
+            background-image: url("{image_url}");
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+        }}
+        </style>
+        """
+            with self._lock:
+                self._styles[key] = style
+        return style
+
+
+static_assets = StaticAssets()
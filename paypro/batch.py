@@ -0,0 +1,289 @@
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from paypro.money import Money, to_paise, to_rupees
+from paypro.rules import load_rule_set
+from paypro.salary import SlipIDGenerator
+
+
+SLIP_COLUMNS = [
+    "slip_id", "employee_id", "username", "calculation_date",
+    "present_days", "total_days", "gross_salary", "proportional_salary",
+    "pf_deduction", "tax_deduction", "hra", "da", "medical_insurance",
+    "transport_allowance", "bonus", "attendance_percentage",
+    "total_deductions", "take_home_salary",
+]
+
+# Amount columns, held as int64 paise; see paypro.money.
+MONEY_COLUMNS = (
+    "gross_salary", "proportional_salary", "pf_deduction", "tax_deduction",
+    "hra", "da", "medical_insurance", "transport_allowance", "bonus",
+    "total_deductions", "take_home_salary",
+)
+
+COLUMN_DTYPES = dict(
+    {"slip_id": object, "employee_id": object, "username": object,
+     "calculation_date": object, "present_days": np.int64, "total_days": np.int64,
+     "attendance_percentage": np.float64},
+    **{name: np.int64 for name in MONEY_COLUMNS})
+
+
+def round2(values):
+    """Vectorized ``round(x, 2)`` that agrees with Python's builtin exactly.
+
+    ``np.round`` scales by 100 before rounding, so values sitting on a
+    half-cent boundary can land on the other side of it.  Those few are
+    re-rounded with the builtin; everything else is already identical.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    ambiguous = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for idx in np.flatnonzero(ambiguous):
+        rounded.flat[idx] = round(float(values.flat[idx]), 2)
+    return rounded
+
+
+class SlipRow(Mapping):
+    """Read-only view of one slip in a SlipBatch, shaped like ``EmployeeSalary.to_dict()``.
+
+    Nothing is copied until a field is read; amounts read as rupee floats
+    (``paise`` gives the exact Money).
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, batch, index):
+        self._columns = batch.columns
+        self._index = index
+
+    def __getitem__(self, name):
+        value = self._columns[name][self._index]
+        if name in MONEY_COLUMNS:
+            return to_rupees(int(value))
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def __iter__(self):
+        return iter(SLIP_COLUMNS)
+
+    def __len__(self):
+        return len(SLIP_COLUMNS)
+
+    def paise(self, name):
+        return Money(self._columns[name][self._index])
+
+    def to_dict(self):
+        return {name: self[name] for name in SLIP_COLUMNS}
+
+
+class SlipBatch:
+    """Salary slips stored column-wise, one typed array per SLIP_COLUMNS field.
+
+    Amounts are int64 paise, days int64 and attendance float64; IDs, names
+    and dates are object arrays.  Indexing with an int gives a SlipRow view
+    and slicing gives a SlipBatch over views of the same arrays, so neither
+    copies slip data.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns):
+        missing = [name for name in SLIP_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"SlipBatch is missing columns: {', '.join(missing)}")
+        # np.asarray only copies a column whose dtype doesn't already match.
+        self.columns = {name: np.asarray(columns[name], dtype=COLUMN_DTYPES[name])
+                        for name in SLIP_COLUMNS}
+        size = len(self.columns["slip_id"])
+        for name, values in self.columns.items():
+            if len(values) != size:
+                raise ValueError(f"{name} has {len(values)} rows, expected {size}")
+
+    def __len__(self):
+        return len(self.columns["slip_id"])
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            size = len(self)
+            if index < 0:
+                index += size
+            if not 0 <= index < size:
+                raise IndexError("SlipBatch index out of range")
+            return SlipRow(self, int(index))
+        return SlipBatch({name: values[index] for name, values in self.columns.items()})
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SlipRow(self, index)
+
+    def nbytes(self):
+        """Bytes held by the column arrays, excluding the objects they point to."""
+        return sum(values.nbytes for values in self.columns.values())
+
+    def to_dicts(self):
+        # Convert column by column; building rows through SlipRow is ~2x slower.
+        columns = [(to_rupees(values) if name in MONEY_COLUMNS else values).tolist()
+                   for name, values in self.columns.items()]
+        return [dict(zip(SLIP_COLUMNS, row)) for row in zip(*columns)]
+
+    def to_frame(self):
+        """DataFrame with the same values as ``to_dicts``: amounts in rupees."""
+        return pd.DataFrame({
+            name: to_rupees(values) if name in MONEY_COLUMNS else values
+            for name, values in self.columns.items()
+        }, columns=SLIP_COLUMNS)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Inverse of ``to_frame``; amounts in rupees are rounded to paise."""
+        return cls({
+            name: to_paise(frame[name].to_numpy()) if name in MONEY_COLUMNS
+            else frame[name].to_numpy()
+            for name in SLIP_COLUMNS
+        })
+
+    def to_arrow(self):
+        """Arrow table with amounts kept as int64 paise.
+
+        Numeric columns are handed to Arrow without copying; the schema
+        metadata marks which columns are paise.
+        """
+        table = pa.table({name: pa.array(values) for name, values in self.columns.items()})
+        return table.replace_schema_metadata(
+            {b"paypro.paise_columns": ",".join(MONEY_COLUMNS).encode("ascii")})
+
+    @classmethod
+    def from_arrow(cls, table):
+        return cls({name: table.column(name).to_numpy() for name in SLIP_COLUMNS})
+
+
+def invalid_rows(gross_salary, present_days, total_days):
+    """``(row, reason)`` for every input row EmployeeSalary can't be paid on.
+
+    Catches what a file can hold but the salary form never allows: blank or
+    negative gross, blank or fractional days, a non-positive month length
+    and more days present than in the month.
+    """
+    gross = np.asarray(gross_salary, dtype=np.float64)
+    present = np.asarray(present_days, dtype=np.float64)
+    total = np.asarray(total_days, dtype=np.float64)
+    checks = (
+        (~np.isfinite(gross), "gross_salary is blank or not a number"),
+        (gross < 0, "gross_salary is negative"),
+        (~np.isfinite(present) | (present != np.floor(present)),
+         "present_days is blank or not a whole number"),
+        (~np.isfinite(total) | (total != np.floor(total)),
+         "total_days is blank or not a whole number"),
+        (total <= 0, "total_days must be greater than 0"),
+        (present < 0, "present_days is negative"),
+        (present > total, "present_days is greater than total_days"),
+    )
+    problems = {}
+    with np.errstate(invalid="ignore"):
+        for mask, reason in checks:
+            for row in np.flatnonzero(mask):
+                problems.setdefault(int(row), reason)
+    return sorted(problems.items())
+
+
+class EmployeeSalaryBatch:
+    """Columnar counterpart of EmployeeSalary for a whole payroll run.
+
+    Inputs are equal-length arrays (or a DataFrame via ``from_frame``) and
+    ``calculate`` fills one array per component with the same arithmetic as
+    ``EmployeeSalary.calculate``, so ``to_frame``/``to_dicts`` match the
+    per-employee ``to_dict`` output value for value.
+    """
+
+    def __init__(self, employee_id, gross_salary, present_days, total_days,
+                 username):
+        self.employee_id = np.asarray(employee_id, dtype=object)
+        self.gross_salary = np.asarray(gross_salary, dtype=np.float64)
+        self.present_days = np.asarray(present_days)
+        self.total_days = np.asarray(total_days)
+        size = len(self.employee_id)
+        if np.ndim(username) == 0:
+            username = [username] * size
+        self.username = np.asarray(username, dtype=object)
+
+        for name in ("gross_salary", "present_days", "total_days", "username"):
+            if len(getattr(self, name)) != size:
+                raise ValueError(
+                    f"{name} has {len(getattr(self, name))} rows, expected {size}")
+        problems = invalid_rows(self.gross_salary, self.present_days, self.total_days)
+        if problems:
+            shown = "; ".join(f"row {row}: {reason}" for row, reason in problems[:5])
+            more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+            raise ValueError(f"Invalid salary inputs: {shown}{more}")
+
+        self.calculation_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.slip_id = np.array(SlipIDGenerator.generate_many(size), dtype=object)
+
+        self.proportional_salary = None
+        self.pf = None
+        self.hra = None
+        self.tax = None
+        self.da = None
+        self.medical_insurance = None
+        self.transport_allowance = None
+        self.bonus = None
+        self.attendance_pct = None
+        self.total_deductions = None
+        self.take_home = None
+
+    @classmethod
+    def from_frame(cls, frame, username=None):
+        if username is None:
+            username = frame["username"].to_numpy()
+        return cls(frame["employee_id"].to_numpy(),
+                   frame["gross_salary"].to_numpy(),
+                   frame["present_days"].to_numpy(),
+                   frame["total_days"].to_numpy(),
+                   username)
+
+    def __len__(self):
+        return len(self.employee_id)
+
+    def calculate(self, rule_set=None):
+        # The same compiled rule function as EmployeeSalary.calculate, fed
+        # arrays instead of scalars; amounts come back as int64 paise.
+        rule_set = rule_set or load_rule_set()
+        results = rule_set.evaluate(
+            self.gross_salary, self.present_days, self.total_days)
+        for name, value in results.items():
+            setattr(self, name, value)
+
+    def to_slip_batch(self):
+        """The calculated slips as a SlipBatch, sharing the result arrays."""
+        return SlipBatch({
+            "slip_id": self.slip_id,
+            "employee_id": self.employee_id,
+            "username": self.username,
+            "calculation_date": np.full(len(self), self.calculation_date, dtype=object),
+            "present_days": self.present_days,
+            "total_days": self.total_days,
+            "gross_salary": to_paise(self.gross_salary),
+            "proportional_salary": self.proportional_salary,
+            "pf_deduction": self.pf,
+            "tax_deduction": self.tax,
+            "hra": self.hra,
+            "da": self.da,
+            "medical_insurance": self.medical_insurance,
+            "transport_allowance": self.transport_allowance,
+            "bonus": self.bonus,
+            "attendance_percentage": round2(self.attendance_pct),
+            "total_deductions": self.total_deductions,
+            "take_home_salary": self.take_home,
+        })
+
+    def to_frame(self):
+        return self.to_slip_batch().to_frame()
+
+    def to_dicts(self):
+        return self.to_slip_batch().to_dicts()
@@ -0,0 +1,166 @@
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from paypro.slip_pdf import SalarySlipPDF
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def slip_filename(slip):
+    employee_id = str(slip.get("employee_id", "unknown"))
+    return f"salary_slip_{_UNSAFE_FILENAME_CHARS.sub('_', employee_id)}.pdf"
+
+
+def unique_slip_filename(slip, seen):
+    """``slip_filename``, made unique against the names in ``seen``.
+
+    IDs such as ``EMP/1`` and ``EMP_1``, or the same employee twice, map to
+    one name; later ones get the slip_id (then a counter) appended.
+    Returns ``(name, collided)`` and adds the name to ``seen``.
+    """
+    name = slip_filename(slip)
+    collided = name in seen
+    if collided:
+        stem = name[:-len(".pdf")] + "_" + _UNSAFE_FILENAME_CHARS.sub(
+            "_", str(slip.get("slip_id", len(seen))))
+        name = f"{stem}.pdf"
+        counter = 1
+        while name in seen:
+            counter += 1
+            name = f"{stem}_{counter}.pdf"
+    seen.add(name)
+    return name, collided
+
+
+def _render_chunk(output_dir, named_slips, use_template):
+    # Runs in a worker process; errors are reported per slip so one bad row
+    # does not sink the rest of its chunk.
+    results = []
+    for name, slip in named_slips:
+        employee_id = slip.get("employee_id", "unknown")
+        started = time.perf_counter()
+        try:
+            pdf_bytes = SalarySlipPDF(slip, use_template=use_template).generate()
+            path = os.path.join(output_dir, name)
+            with open(path, "wb") as handle:
+                handle.write(pdf_bytes)
+        except Exception as exc:
+            results.append((employee_id, None, time.perf_counter() - started,
+                            f"{type(exc).__name__}: {exc}"))
+        else:
+            results.append((employee_id, path, time.perf_counter() - started, None))
+    return results
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1,
+                      int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class BulkSlipRenderer:
+    """Renders many salary slips to ``salary_slip_<employee_id>.pdf`` files.
+
+    Slips are sent to a process pool in chunks of ``chunk_size``, and at most
+    ``max_pending_chunks`` chunks are in flight.  That way a generator of
+    50k slips never has to be held in memory at once.  Workers use the
+    precompiled SlipTemplate unless ``use_template`` is off.
+
+    File names are made unique across every ``render`` call on one renderer
+    (see ``unique_slip_filename``), so no slip overwrites another's PDF;
+    ``collisions`` in the summary counts the renamed ones.
+
+    Used as a context manager, one process pool serves every ``render``
+    call until exit; otherwise each call starts and stops its own.
+    """
+
+    def __init__(self, output_dir, workers=None, chunk_size=200,
+                 max_pending_chunks=None, use_template=True):
+        self.output_dir = output_dir
+        self.use_template = use_template
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or self.workers * 2
+        self._names = set()
+        self._executor = None
+
+    def __enter__(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _chunks(self, slips, collisions):
+        slips = iter(slips)
+        while True:
+            chunk = []
+            for slip in islice(slips, self.chunk_size):
+                name, collided = unique_slip_filename(slip, self._names)
+                collisions[0] += collided
+                chunk.append((name, slip))
+            if not chunk:
+                return
+            yield chunk
+
+    def render(self, slips):
+        if self._executor is not None:
+            return self._render(self._executor, slips)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return self._render(executor, slips)
+
+    def _render(self, executor, slips):
+        os.makedirs(self.output_dir, exist_ok=True)
+        durations = []
+        errors = []
+        rendered = 0
+        collisions = [0]
+        started = time.perf_counter()
+
+        chunks = self._chunks(slips, collisions)
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < self.max_pending_chunks:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(
+                    _render_chunk, self.output_dir, chunk, self.use_template))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for employee_id, path, seconds, error in future.result():
+                    durations.append(seconds)
+                    if error is None:
+                        rendered += 1
+                    else:
+                        errors.append({"employee_id": employee_id, "error": error})
+
+        elapsed = time.perf_counter() - started
+        durations.sort()
+        return {
+            "total": len(durations),
+            "rendered": rendered,
+            "failed": len(errors),
+            "collisions": collisions[0],
+            "errors": errors,
+            "workers": self.workers,
+            "seconds": round(elapsed, 3),
+            "slips_per_sec": round(len(durations) / elapsed, 1) if elapsed > 0 else 0.0,
+            "p50_ms": round(_percentile(durations, 50) * 1000, 3),
+            "p99_ms": round(_percentile(durations, 99) * 1000, 3),
+        }
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and/or total size.
+
+    ``sizeof`` measures a value for the ``max_bytes`` budget; values larger
+    than the whole budget are returned but never stored.  Build time of each
+    cached value is remembered so ``stats`` can report the time hits saved.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()  # key -> (value, size, build_seconds)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._saved_seconds = 0.0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            self._saved_seconds += entry[2]
+            return entry[0]
+
+    def put(self, key, value, build_seconds=0.0):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, size, build_seconds)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._data and (
+                (self.max_entries is not None and len(self._data) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, building it with ``factory`` on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        started = time.perf_counter()
+        value = factory()
+        self.put(key, value, time.perf_counter() - started)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "saved_seconds": round(self._saved_seconds, 6),
+            }
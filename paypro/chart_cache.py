@@ -0,0 +1,36 @@
+import logging
+import time
+
+from paypro.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Prebuilt Plotly figures and DataFrames for the salary breakdown, keyed by
+# the slip's numeric components.  A few hundred entries covers every active
+# session without holding on to stale slips forever.
+breakdown_cache = LRUCache(max_entries=256)
+
+BREAKDOWN_FIELDS = (
+    "gross_salary", "proportional_salary", "present_days", "total_days",
+    "hra", "da", "transport_allowance", "medical_insurance", "bonus",
+    "pf", "tax", "total_deductions", "take_home",
+)
+
+
+def breakdown_key(emp_salary, rules_version=None):
+    # Labels come from the salary rules, so their version is part of the key.
+    return (rules_version,) + tuple(getattr(emp_salary, field) for field in BREAKDOWN_FIELDS)
+
+
+def get_breakdown_views(emp_salary, build, rules_version=None):
+    """Cached ``build()`` result for this slip's numbers, with hit/miss timing logged."""
+    started = time.perf_counter()
+    misses = breakdown_cache.stats()["misses"]
+    views = breakdown_cache.get_or_create(
+        breakdown_key(emp_salary, rules_version), build)
+    stats = breakdown_cache.stats()
+    logger.info(
+        "salary breakdown views %s in %.2f ms (total saved by cache: %.1f ms)",
+        "built" if stats["misses"] > misses else "reused",
+        (time.perf_counter() - started) * 1000, stats["saved_seconds"] * 1000)
+    return views
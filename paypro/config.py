@@ -0,0 +1,56 @@
+"""Deployment settings, read from the environment.
+
+``PAYPRO_STORAGE`` picks the storage backend: ``mysql`` (the default, a
+MySQL server on localhost) or ``sqlite`` (an embedded database file at
+``PAYPRO_SQLITE_PATH``, for single-node deployments and load tests).
+
+``PAYPRO_SCRYPT_N``, ``PAYPRO_SCRYPT_R`` and ``PAYPRO_SCRYPT_P`` override
+the password hashing work factor (see paypro.passwords).
+
+``PAYPRO_DEAD_LETTER_PATH`` is the JSON-lines file where the write-behind
+queue keeps slips it could not save after retrying.
+"""
+import os
+
+STORAGE_BACKENDS = ("mysql", "sqlite")
+
+DEFAULT_SQLITE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "paypro.sqlite3")
+DEFAULT_DEAD_LETTER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "paypro-dead-letter.jsonl")
+
+
+def storage_backend():
+    backend = os.environ.get("PAYPRO_STORAGE", "mysql").strip().lower()
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"PAYPRO_STORAGE must be one of {', '.join(STORAGE_BACKENDS)}, not {backend!r}")
+    return backend
+
+
+def sqlite_path():
+    return os.environ.get("PAYPRO_SQLITE_PATH") or DEFAULT_SQLITE_PATH
+
+
+def dead_letter_path():
+    return os.environ.get("PAYPRO_DEAD_LETTER_PATH") or DEFAULT_DEAD_LETTER_PATH
+
+
+def _int_setting(name):
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, not {value!r}") from None
+
+
+def scrypt_settings():
+    """PasswordHasher keyword arguments set in the environment."""
+    settings = {}
+    for option in ("n", "r", "p"):
+        value = _int_setting(f"PAYPRO_SCRYPT_{option.upper()}")
+        if value is not None:
+            settings[option] = value
+    return settings
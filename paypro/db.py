@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pymysql
+from pymysql.cursors import DictCursor
+
+from paypro.metrics import time_sql
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
+
+class InstrumentedCursor(DictCursor):
+    """DictCursor that records every statement in paypro.metrics."""
+
+    _in_executemany = False
+
+    def execute(self, query, args=None):
+        # executemany re-enters execute for each rewritten chunk; it is
+        # already being timed as one batch.
+        if self._in_executemany:
+            return super().execute(query, args)
+        with time_sql("mysql", query):
+            return super().execute(query, args)
+
+    def executemany(self, query, args):
+        args = list(args)
+        self._in_executemany = True
+        try:
+            with time_sql("mysql", query, rows=len(args)):
+                return super().executemany(query, args)
+        finally:
+            self._in_executemany = False
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of pymysql connections.
+
+    Streamlit re-executes page scripts on every rerun but keeps imported
+    modules, so pools created through ``get_pool`` live for the whole process
+    and are shared by every session.  Idle connections are pinged before reuse
+    once they have sat longer than ``ping_interval`` and are closed after
+    ``max_idle_seconds``.
+    """
+
+    # Errors that mean the link itself is broken rather than the statement.
+    connection_errors = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+    def __init__(self, max_size=10, max_idle_seconds=300, ping_interval=30,
+                 checkout_timeout=10, **connect_kwargs):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.ping_interval = ping_interval
+        self.checkout_timeout = checkout_timeout
+        connect_kwargs.setdefault("cursorclass", InstrumentedCursor)
+        # Pooled connections are shared between callers, so never leave a
+        # snapshot open between checkouts; explicit begin() still works.
+        connect_kwargs.setdefault("autocommit", True)
+        self.connect_kwargs = connect_kwargs
+
+        self._idle = deque()  # (connection, last_used) pairs, newest last
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._created = 0
+        self._closed = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _connect(self):
+        return pymysql.connect(**self.connect_kwargs)
+
+    def _evict_idle(self, now):
+        # Oldest connections sit at the left end of the deque.
+        while self._idle and now - self._idle[0][1] > self.max_idle_seconds:
+            conn, _ = self._idle.popleft()
+            self._close_quietly(conn)
+
+    def _close_quietly(self, conn):
+        self._closed += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        waited = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._evict_idle(now)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_size:
+                    conn, last_used = None, None
+                    self._in_use += 1
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.checkout_timeout}s "
+                        f"({self.max_size} in use)")
+                waited = True
+                self._cond.wait(remaining)
+
+            self._checkouts += 1
+            if waited:
+                wait = time.monotonic() - started
+                self._waits += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+
+        # Network work happens outside the lock; the slot is already reserved.
+        try:
+            if conn is None:
+                conn = self._connect()
+                with self._cond:
+                    self._created += 1
+            elif time.monotonic() - last_used > self.ping_interval:
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    with self._cond:
+                        self._close_quietly(conn)
+                    conn = self._connect()
+                    with self._cond:
+                        self._created += 1
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def release(self, conn, discard=False):
+        with self._cond:
+            self._in_use -= 1
+            if discard or not conn.open:
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._evict_idle(time.monotonic())
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except self.connection_errors:
+            # The link itself is suspect; don't hand it to the next caller.
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "created": self._created,
+                "closed": self._closed,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+            }
+
+    def close(self):
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._close_quietly(conn)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(max_size=10, **connect_kwargs):
+    """Return the process-wide pool for these connection settings."""
+    key = tuple(sorted((k, repr(v)) for k, v in connect_kwargs.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(max_size=max_size, **connect_kwargs)
+            _pools[key] = pool
+        return pool
+
+
+def pool_stats():
+    """Stats for every pool in the process, keyed by ``user@host/database``."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {
+        "{user}@{host}/{database}".format(
+            user=pool.connect_kwargs.get("user"),
+            host=pool.connect_kwargs.get("host", "localhost"),
+            database=pool.connect_kwargs.get("database")): pool.stats()
+        for pool in pools
+    }
@@ -0,0 +1,116 @@
+"""Monotonic, k-sortable slip IDs that processes can mint without coordination.
+
+An ID packs 90 bits, most significant first:
+
+    48 bits  Unix time in milliseconds
+     8 bits  node, from PAYPRO_NODE_ID (0-255), to tell hosts apart
+    22 bits  process ID (Linux pid_max is at most 2**22)
+    12 bits  per-process sequence within the millisecond
+
+and is written as ``SLIP-`` plus 18 Crockford base32 characters.  That
+alphabet is in ASCII order, so IDs sort as strings in the order they were
+minted and inserts land at the right-hand end of the primary key index.
+Two live processes on a host never share a pid, so no locking across
+processes is needed; threads share one generator behind a lock.
+"""
+import base64
+import os
+import threading
+import time
+
+PREFIX = "SLIP-"
+NODE_BITS = 8
+PID_BITS = 22
+SEQUENCE_BITS = 12
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+_RFC4648 = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+_CROCKFORD = b"0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_TO_CROCKFORD = bytes.maketrans(_RFC4648, _CROCKFORD)
+
+
+def _encode(value):
+    # 15 bytes is 24 base32 characters with no padding; the top 30 bits are
+    # always zero, so the first six characters are dropped.
+    encoded = base64.b32encode(value.to_bytes(15, "big")).translate(_TO_CROCKFORD)
+    return PREFIX + encoded[6:].decode("ascii")
+
+
+def decode(slip_id):
+    """``(milliseconds, node, pid, sequence)`` packed into ``slip_id``."""
+    value = 0
+    for char in slip_id[len(PREFIX):].encode("ascii"):
+        value = (value << 5) | _CROCKFORD.index(char)
+    sequence = value & MAX_SEQUENCE
+    pid = (value >> SEQUENCE_BITS) & ((1 << PID_BITS) - 1)
+    node = (value >> (SEQUENCE_BITS + PID_BITS)) & ((1 << NODE_BITS) - 1)
+    millis = value >> (SEQUENCE_BITS + PID_BITS + NODE_BITS)
+    return millis, node, pid, sequence
+
+
+class SlipIDFactory:
+    """Thread-safe generator of k-sortable slip IDs for this process.
+
+    If the clock steps backwards the last timestamp is reused, and when a
+    millisecond's 4096 sequence numbers run out the timestamp is advanced
+    by one instead of sleeping, so IDs stay strictly increasing.
+    """
+
+    def __init__(self, node=None):
+        if node is None:
+            node = int(os.environ.get("PAYPRO_NODE_ID", "0"))
+        if not 0 <= node < (1 << NODE_BITS):
+            raise ValueError(f"node must be between 0 and {(1 << NODE_BITS) - 1}")
+        self.node = node
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid() & ((1 << PID_BITS) - 1)
+        self._prefix = ((self.node << PID_BITS) | self.pid) << SEQUENCE_BITS
+        self._last_millis = -1
+        self._sequence = 0
+
+    def _next(self):
+        millis = time.time_ns() // 1_000_000
+        if millis > self._last_millis:
+            self._last_millis = millis
+            self._sequence = 0
+        elif self._sequence < MAX_SEQUENCE:
+            self._sequence += 1
+        else:
+            self._last_millis += 1
+            self._sequence = 0
+        return (self._last_millis << (NODE_BITS + PID_BITS + SEQUENCE_BITS)) \
+            | self._prefix | self._sequence
+
+    def generate(self):
+        with self._lock:
+            value = self._next()
+        return _encode(value)
+
+    def generate_many(self, count):
+        """``count`` consecutive IDs for one batch, taking the lock once."""
+        with self._lock:
+            values = [self._next() for _ in range(count)]
+        return [_encode(value) for value in values]
+
+
+_factory = SlipIDFactory()
+
+
+def _after_fork():
+    # A forked worker has a new pid; restart its sequence from scratch.
+    _factory._lock = threading.Lock()
+    _factory._reset()
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def new_slip_id():
+    return _factory.generate()
+
+
+def new_slip_ids(count):
+    return _factory.generate_many(count)
@@ -0,0 +1,385 @@
+"""Always-on latency histograms and counters in Prometheus text format.
+
+Page reruns, SQL statements and PDF renders are recorded into process-wide
+histograms.  One observation is a perf_counter pair, a bisect over the
+bucket bounds and a few list updates under a lock, a couple of
+microseconds against page reruns that take tens of milliseconds.
+
+Stats that components already keep (database pool usage, the sign-up
+username index, the PDF and chart caches) are read only at export time, and only from modules some page has imported.
+
+Export is off unless configured:
+
+    PAYPRO_METRICS_PORT=9464         serve /metrics on 127.0.0.1:9464
+    PAYPRO_METRICS_FILE=/path.prom   rewrite a textfile-collector file
+                                     every PAYPRO_METRICS_INTERVAL seconds
+"""
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from paypro.profiling import maybe_profile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    pairs = ",".join('%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                     for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        bounds = [repr(float(b)) for b in self.buckets] + ["+Inf"]
+        for labelvalues, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                labels = _label_text(self.labelnames + ("le",), labelvalues + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_text(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {values[-1]!r}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            lines.append(f"{self.name}{_label_text(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+class CollectedMetric:
+    """Gauge or counter whose values are read from ``collect()`` at export.
+
+    ``collect`` returns ``{label values: number}``; nothing is recorded on
+    the hot path.
+    """
+
+    def __init__(self, name, documentation, labelnames=(), collect=dict, kind="gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.kind = kind
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            values = self.collect()
+        except Exception:
+            # One broken source must not take the whole endpoint down.
+            logger.warning("Could not collect %s", self.name, exc_info=True)
+            values = {}
+        for labelvalues, value in sorted(values.items()):
+            lines.append(f"{self.name}{_label_text(self.labelnames, labelvalues)} {value!r}")
+        return lines
+
+
+def _loaded(module):
+    # Exporting never imports a component (or its database driver) itself.
+    return sys.modules.get(module)
+
+
+def _pool_values(*fields):
+    def collect():
+        db = _loaded("paypro.db")
+        if db is None:
+            return {}
+        values = {}
+        for pool, stats in db.pool_stats().items():
+            for field in fields:
+                labels = (pool, field) if len(fields) > 1 else (pool,)
+                values[labels] = stats[field]
+        return values
+    return collect
+
+
+def _username_index_value(field):
+    def collect():
+        module = _loaded("paypro.username_index")
+        stats = module.username_index_stats() if module is not None else None
+        return {} if stats is None else {(): stats[field]}
+    return collect
+
+
+# cache label -> (module, module-level LRUCache attribute)
+CACHES = {
+    "pdf": ("paypro.pdf_cache", "pdf_cache"),
+    "breakdown": ("paypro.chart_cache", "breakdown_cache"),
+}
+
+
+def _cache_values(field):
+    def collect():
+        values = {}
+        for label, (module_name, attribute) in CACHES.items():
+            module = _loaded(module_name)
+            if module is not None:
+                values[(label,)] = getattr(module, attribute).stats()[field]
+        return values
+    return collect
+
+
+PAGE_RERUN_SECONDS = Histogram(
+    "paypro_page_rerun_seconds", "Wall time of one Streamlit page script run.", ("page",))
+PAGE_ERRORS = Counter(
+    "paypro_page_errors_total", "Page runs that raised an unexpected exception.", ("page",))
+SQL_SECONDS = Histogram(
+    "paypro_sql_statement_seconds", "Time spent executing one SQL statement or batch.",
+    ("backend", "statement"))
+SQL_ROWS = Counter(
+    "paypro_sql_rows_total", "Parameter rows sent with SQL statements.", ("backend", "statement"))
+SQL_ERRORS = Counter(
+    "paypro_sql_errors_total", "SQL statements that raised.", ("backend", "statement"))
+PDF_RENDER_SECONDS = Histogram(
+    "paypro_pdf_render_seconds", "Time to render one salary slip PDF.", ("path",))
+
+DB_POOL_CONNECTIONS = CollectedMetric(
+    "paypro_db_pool_connections", "MySQL pool connections by state.", ("pool", "state"),
+    _pool_values("in_use", "idle"))
+DB_POOL_MAX = CollectedMetric(
+    "paypro_db_pool_max_connections", "MySQL pool size limit.", ("pool",),
+    _pool_values("max_size"))
+DB_POOL_CHECKOUTS = CollectedMetric(
+    "paypro_db_pool_checkouts_total", "Connections checked out of the pool.", ("pool",),
+    _pool_values("checkouts"), kind="counter")
+DB_POOL_WAITS = CollectedMetric(
+    "paypro_db_pool_waits_total", "Checkouts that had to wait for a free connection.",
+    ("pool",), _pool_values("waits"), kind="counter")
+DB_POOL_WAIT_SECONDS = CollectedMetric(
+    "paypro_db_pool_wait_seconds_total", "Time checkouts spent waiting for a connection.",
+    ("pool",), _pool_values("wait_seconds_total"), kind="counter")
+DB_POOL_WAIT_MAX = CollectedMetric(
+    "paypro_db_pool_wait_seconds_max", "Longest single checkout wait.", ("pool",),
+    _pool_values("wait_seconds_max"))
+
+USERNAME_CHECKS = CollectedMetric(
+    "paypro_username_checks_total", "Sign-up username availability checks.",
+    collect=_username_index_value("checks"), kind="counter")
+USERNAME_QUERIES_AVOIDED = CollectedMetric(
+    "paypro_username_queries_avoided_total",
+    "Username checks answered by the in-process index without a query.",
+    collect=_username_index_value("queries_avoided"), kind="counter")
+USERNAME_DB_QUERIES = CollectedMetric(
+    "paypro_username_db_queries_total", "Username checks that went to the database.",
+    collect=_username_index_value("db_queries"), kind="counter")
+USERNAME_FALSE_POSITIVES = CollectedMetric(
+    "paypro_username_false_positives_total",
+    "Database checks the Bloom filter sent for a username that was free.",
+    collect=_username_index_value("false_positives"), kind="counter")
+USERNAME_FALSE_POSITIVE_RATE = CollectedMetric(
+    "paypro_username_false_positive_rate",
+    "Observed share of free usernames the Bloom filter still sent to the database.",
+    collect=_username_index_value("false_positive_rate"))
+USERNAME_EXPECTED_FALSE_POSITIVE_RATE = CollectedMetric(
+    "paypro_username_expected_false_positive_rate",
+    "False-positive rate the Bloom filter's fill predicts.",
+    collect=_username_index_value("expected_false_positive_rate"))
+
+CACHE_HITS = CollectedMetric(
+    "paypro_cache_hits_total", "In-process cache lookups answered from the cache.",
+    ("cache",), _cache_values("hits"), kind="counter")
+CACHE_MISSES = CollectedMetric(
+    "paypro_cache_misses_total", "In-process cache lookups that had to build the value.",
+    ("cache",), _cache_values("misses"), kind="counter")
+CACHE_EVICTIONS = CollectedMetric(
+    "paypro_cache_evictions_total", "Entries evicted to stay within the cache's limits.",
+    ("cache",), _cache_values("evictions"), kind="counter")
+CACHE_ENTRIES = CollectedMetric(
+    "paypro_cache_entries", "Entries held by the cache.", ("cache",), _cache_values("entries"))
+CACHE_BYTES = CollectedMetric(
+    "paypro_cache_bytes", "Bytes held by caches bounded by size (0 otherwise).", ("cache",),
+    _cache_values("bytes"))
+CACHE_SAVED_SECONDS = CollectedMetric(
+    "paypro_cache_saved_seconds_total", "Build time that cache hits saved.", ("cache",),
+    _cache_values("saved_seconds"), kind="counter")
+
+REGISTRY = [PAGE_RERUN_SECONDS, PAGE_ERRORS, SQL_SECONDS, SQL_ROWS, SQL_ERRORS,
+            PDF_RENDER_SECONDS, DB_POOL_CONNECTIONS, DB_POOL_MAX, DB_POOL_CHECKOUTS,
+            DB_POOL_WAITS, DB_POOL_WAIT_SECONDS, DB_POOL_WAIT_MAX,
+            USERNAME_CHECKS, USERNAME_QUERIES_AVOIDED, USERNAME_DB_QUERIES,
+            USERNAME_FALSE_POSITIVES, USERNAME_FALSE_POSITIVE_RATE,
+            USERNAME_EXPECTED_FALSE_POSITIVE_RATE, CACHE_HITS, CACHE_MISSES,
+            CACHE_EVICTIONS, CACHE_ENTRIES, CACHE_BYTES, CACHE_SAVED_SECONDS]
+
+
+def render_prometheus():
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+`?(\w+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=512)
+def statement_label(sql):
+    """Low-cardinality label such as ``SELECT users`` for a SQL string."""
+    words = sql.split(None, 1)
+    if not words:
+        return "EMPTY"
+    match = _TABLE_RE.search(sql)
+    verb = words[0].upper()
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+@contextmanager
+def time_sql(backend, sql, rows=1):
+    label = statement_label(sql)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        SQL_ERRORS.inc(backend, label)
+        raise
+    finally:
+        SQL_SECONDS.observe(time.perf_counter() - started, backend, label)
+        SQL_ROWS.inc(backend, label, amount=rows)
+
+
+# Streamlit ends a run early by raising these; they are control flow, not errors.
+_CONTROL_FLOW = ("RerunException", "StopException")
+
+
+def page_rerun(page):
+    """Decorator recording each call of a page's entry method as one rerun.
+
+    The same wrapper is where paypro.profiling samples reruns when enabled.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ensure_exporter()
+            started = time.perf_counter()
+            try:
+                with maybe_profile(page):
+                    return func(*args, **kwargs)
+            except Exception as exc:
+                if type(exc).__name__ not in _CONTROL_FLOW:
+                    PAGE_ERRORS.inc(page)
+                raise
+            finally:
+                PAGE_RERUN_SECONDS.observe(time.perf_counter() - started, page)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, addr="127.0.0.1"):
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_textfile(path):
+    # Write then rename so a scraper never reads a half-written file.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+def _write_textfile_forever(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_textfile(path)
+        except OSError:
+            pass
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def ensure_exporter():
+    """Start the exporters configured in the environment, once per process."""
+    global _exporter_started
+    if _exporter_started:
+        return
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+        port = os.environ.get("PAYPRO_METRICS_PORT")
+        if port:
+            start_http_server(int(port), os.environ.get("PAYPRO_METRICS_ADDR", "127.0.0.1"))
+        path = os.environ.get("PAYPRO_METRICS_FILE")
+        if path:
+            interval = float(os.environ.get("PAYPRO_METRICS_INTERVAL", "15"))
+            threading.Thread(target=_write_textfile_forever, args=(path, interval),
+                             name="metrics-textfile", daemon=True).start()
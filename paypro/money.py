@@ -0,0 +1,148 @@
+"""Exact money arithmetic in integer paise.
+
+Salary components are computed as whole paise: Python ints for one
+employee, int64 arrays for a batch.  Rounding happens in exactly two
+places, both round-half-up (ties towards +infinity):
+
+* ``to_paise`` turns a rupee input into paise.  Floats are scaled by 100
+  in float64 first, the same operation for a scalar and an array, so both
+  paths agree; ``Decimal`` and ``str`` inputs are rounded exactly.
+* ``div_round`` divides paise by an integer, e.g. paise x present days /
+  total days, or paise x 12 / 100 for a 12% rate.
+
+Everything else (sums, differences, totals) is exact, so deductions and
+take-home always reconcile to the paisa.  Integer arithmetic is about
+twice as fast as ``decimal.Decimal`` with quantize and gives the same
+results; see ``benchmarks/bench_money.py``.
+"""
+import functools
+import math
+from decimal import ROUND_FLOOR, Decimal
+
+import numpy as np
+
+PAISE_PER_RUPEE = 100
+
+_HALF = Decimal("0.5")
+
+
+def div_round(numerator, denominator):
+    """``numerator / denominator`` rounded half-up, for ints or int64 arrays.
+
+    ``denominator`` must be positive.
+    """
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def to_paise(rupees):
+    """Rupees (float, int, Decimal, str or an array) as whole paise."""
+    if isinstance(rupees, np.ndarray):
+        if rupees.dtype.kind in "iu":
+            return rupees.astype(np.int64) * PAISE_PER_RUPEE
+        return np.floor(rupees.astype(np.float64) * PAISE_PER_RUPEE + 0.5).astype(np.int64)
+    if isinstance(rupees, int):
+        return rupees * PAISE_PER_RUPEE
+    if isinstance(rupees, (Decimal, str)):
+        scaled = Decimal(rupees) * PAISE_PER_RUPEE + _HALF
+        return int(scaled.to_integral_value(rounding=ROUND_FLOOR))
+    return math.floor(float(rupees) * PAISE_PER_RUPEE + 0.5)
+
+
+def to_rupees(paise):
+    """Paise as float rupees, the nearest double to the exact amount."""
+    return paise / PAISE_PER_RUPEE
+
+
+@functools.total_ordering
+class Money:
+    """An amount in whole paise.
+
+    Adds, subtracts and compares with other Money (and with 0, so ``sum``
+    works).  Multiplying by an int stays exact; dividing returns a float,
+    since ratios and per-day rates are not amounts.  ``format`` applies
+    float format specs to the rupee value, so ``f"{m:,.2f}"`` prints the
+    exact amount.
+    """
+
+    __slots__ = ("paise",)
+
+    def __init__(self, paise):
+        self.paise = int(paise)
+
+    @classmethod
+    def from_rupees(cls, rupees):
+        return cls(to_paise(rupees))
+
+    @property
+    def rupees(self):
+        return to_rupees(self.paise)
+
+    def to_decimal(self):
+        return Decimal(self.paise).scaleb(-2)
+
+    def _other(self, other):
+        if isinstance(other, Money):
+            return other.paise
+        if isinstance(other, int) and other == 0:
+            return 0
+        return NotImplemented
+
+    def __add__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is NotImplemented else Money(self.paise + other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is NotImplemented else Money(self.paise - other)
+
+    def __rsub__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is NotImplemented else Money(other - self.paise)
+
+    def __neg__(self):
+        return Money(-self.paise)
+
+    def __abs__(self):
+        return Money(abs(self.paise))
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return Money(self.paise * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Money):
+            return self.paise / other.paise
+        return self.rupees / other
+
+    def __eq__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is NotImplemented else self.paise == other
+
+    def __lt__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is NotImplemented else self.paise < other
+
+    def __hash__(self):
+        return hash(self.paise)
+
+    def __bool__(self):
+        return self.paise != 0
+
+    def __float__(self):
+        return self.rupees
+
+    def __format__(self, spec):
+        return format(self.rupees, spec) if spec else str(self)
+
+    def __str__(self):
+        sign = "-" if self.paise < 0 else ""
+        rupees, paise = divmod(abs(self.paise), PAISE_PER_RUPEE)
+        return f"{sign}{rupees}.{paise:02d}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
@@ -0,0 +1,120 @@
+import atexit
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from paypro import config
+
+SCHEME = "scrypt"
+
+# scrypt work factors: memory per hash is 128 * n * r bytes (16 MB here).
+DEFAULT_N = 2 ** 14
+DEFAULT_R = 8
+DEFAULT_P = 1
+
+
+def _b64encode(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _b64decode(text):
+    return base64.b64decode(text.encode("ascii"))
+
+
+class PasswordHasher:
+    """Salted scrypt password hashes with a tunable work factor.
+
+    Hashes are stored as ``scrypt$<n>$<r>$<p>$<salt>$<digest>`` so every row
+    carries the parameters it was made with.  ``needs_rehash`` reports rows
+    made with other parameters (or legacy plain-text rows) so callers can
+    upgrade them on the next successful login.
+
+    scrypt releases the GIL, so hashing runs on a bounded thread pool: at
+    most ``workers`` hashes (and ``workers`` x 128·n·r bytes) are in flight,
+    and the rest wait instead of starving the Streamlit server threads.
+    """
+
+    def __init__(self, n=DEFAULT_N, r=DEFAULT_R, p=DEFAULT_P, salt_bytes=16,
+                 dklen=32, workers=None):
+        if n < 2 or n & (n - 1):
+            raise ValueError("scrypt n must be a power of two greater than 1")
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_bytes = salt_bytes
+        self.dklen = dklen
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hash")
+
+    def _derive(self, password, salt, n, r, p, dklen):
+        return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r * p, dklen=dklen)
+
+    def _hash(self, password):
+        salt = os.urandom(self.salt_bytes)
+        digest = self._derive(password, salt, self.n, self.r, self.p, self.dklen)
+        return "$".join((SCHEME, str(self.n), str(self.r), str(self.p),
+                         _b64encode(salt), _b64encode(digest)))
+
+    def _verify(self, password, stored):
+        parts = stored.split("$")
+        if len(parts) != 6 or parts[0] != SCHEME:
+            # Rows written before hashing was introduced hold the password itself.
+            return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        _, n, r, p, salt, digest = parts
+        try:
+            digest = _b64decode(digest)
+            candidate = self._derive(password, _b64decode(salt), int(n), int(r), int(p),
+                                     len(digest))
+        except ValueError:
+            # A corrupt scrypt row (bad number, base64 or parameters) never matches.
+            return False
+        return hmac.compare_digest(candidate, digest)
+
+    def hash(self, password):
+        """Encoded scrypt hash of ``password`` with a fresh random salt."""
+        return self._executor.submit(self._hash, password).result()
+
+    def verify(self, password, stored):
+        """True if ``password`` matches the stored hash (or legacy plain text)."""
+        return self._executor.submit(self._verify, password, stored).result()
+
+    def dummy_verify(self, password):
+        """Burn one hash's worth of time so unknown usernames answer no faster."""
+        self.hash(password)
+        return False
+
+    def needs_rehash(self, stored):
+        parts = stored.split("$")
+        if len(parts) != 6 or parts[0] != SCHEME:
+            return True
+        try:
+            dklen = len(_b64decode(parts[5]))
+        except ValueError:
+            return True
+        return parts[1:4] != [str(self.n), str(self.r), str(self.p)] or dklen != self.dklen
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher(**options):
+    """Return the process-wide hasher, creating it on first use.
+
+    The work factor comes from ``PAYPRO_SCRYPT_N/R/P`` (see paypro.config)
+    unless ``options`` sets it.
+    """
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher(**{**config.scrypt_settings(), **options})
+            atexit.register(_hasher.shutdown)
+        return _hasher
@@ -0,0 +1,26 @@
+import hashlib
+import json
+
+from paypro.cache import LRUCache
+from paypro.rules import load_rule_set
+
+# Rendered slips are a few KB each, so 32 MB keeps thousands of them.
+PDF_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+pdf_cache = LRUCache(max_bytes=PDF_CACHE_MAX_BYTES, sizeof=len)
+
+
+def slip_cache_key(slip, rules_version=None):
+    """Stable content hash of a slip dict, independent of key order.
+
+    Slip labels come from the salary rules, so their fingerprint is hashed too.
+    """
+    payload = json.dumps([rules_version, slip], sort_keys=True, default=str,
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_slip_pdf(slip, render):
+    """PDF bytes for ``slip``; ``render()`` only runs the first time a slip is seen."""
+    key = slip_cache_key(slip, load_rule_set().fingerprint)
+    return pdf_cache.get_or_create(key, render)
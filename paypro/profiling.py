@@ -0,0 +1,184 @@
+"""Opt-in cProfile + tracemalloc capture of individual page reruns.
+
+Off by default.  Every page wrapped in ``paypro.metrics.page_rerun`` checks
+these settings on each run:
+
+    PAYPRO_PROFILE_RATE=0.05    profile this fraction of reruns (0..1)
+    PAYPRO_PROFILE_QUERY=1      also profile any rerun opened with ?profile=1
+    PAYPRO_PROFILE_DIR=...      output directory (default: ./profiles)
+    PAYPRO_PROFILE_KEEP=50      profiled runs kept before the oldest are deleted
+    PAYPRO_PROFILE_TOP=25       allocation sites listed per run
+
+Each profiled rerun writes ``<stamp>-<page>.collapsed`` (one
+``frame;frame;frame microseconds`` line per stack, for flamegraph.pl or
+speedscope), ``<stamp>-<page>.pstats`` (raw cProfile data) and
+``<stamp>-<page>.alloc.txt`` (top allocation sites by size).
+Only one rerun is profiled at a time; tracemalloc is process-wide.
+"""
+import cProfile
+import glob
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+DEFAULT_PROFILE_DIR = "profiles"
+
+logger = logging.getLogger(__name__)
+
+_active = threading.Lock()
+
+
+def _rate():
+    try:
+        return float(os.environ.get("PAYPRO_PROFILE_RATE", "0"))
+    except ValueError:
+        return 0.0
+
+
+def _int_setting(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _query_requested():
+    # Only consult Streamlit if a page already imported it; the core stays
+    # importable without it.
+    if os.environ.get("PAYPRO_PROFILE_QUERY") != "1":
+        return False
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return False
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:
+        return False
+
+
+def should_profile():
+    rate = _rate()
+    if rate > 0 and random.random() < rate:
+        return True
+    return _query_requested()
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-ins such as <built-in method time.sleep>
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats, min_us=1.0, max_depth=128):
+    """Approximate folded stacks from cProfile caller/callee data.
+
+    cProfile keeps call edges rather than full stacks, so time is pushed
+    down from the roots, splitting each function's time across its
+    callees by their cumulative time on that edge.  Recursive edges are
+    cut, and branches under ``min_us`` are dropped.
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    folded = defaultdict(float)
+
+    def walk(func, stack, on_stack, budget):
+        _, _, own, cumulative, _ = entries[func]
+        scale = budget / cumulative if cumulative else 0.0
+        folded[";".join(stack)] += own * scale * 1e6
+        if len(stack) >= max_depth:
+            return
+        for child, child_cumulative in callees.get(func, {}).items():
+            weight = child_cumulative * scale
+            if child in on_stack or child not in entries or weight * 1e6 < min_us:
+                continue
+            on_stack.add(child)
+            walk(child, stack + [_frame_label(child)], on_stack, weight)
+            on_stack.discard(child)
+
+    for func, (_, _, _, cumulative, callers) in entries.items():
+        if not callers:
+            walk(func, [_frame_label(func)], {func}, cumulative)
+    return [f"{stack} {int(round(us))}" for stack, us in sorted(folded.items()) if us >= 0.5]
+
+
+def _rotate(directory, keep):
+    runs = sorted(glob.glob(os.path.join(directory, "*.pstats")))
+    for stale in runs[:max(0, len(runs) - keep)]:
+        prefix = stale[:-len(".pstats")]
+        for path in glob.glob(glob.escape(prefix) + ".*"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _write(page, profiler, snapshot, seconds):
+    directory = os.environ.get("PAYPRO_PROFILE_DIR") or DEFAULT_PROFILE_DIR
+    keep = _int_setting("PAYPRO_PROFILE_KEEP", 50)
+    top = _int_setting("PAYPRO_PROFILE_TOP", 25)
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1e6) % 1000000:06d}"
+    prefix = os.path.join(directory, f"{stamp}-{page}")
+
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(prefix + ".pstats")
+    with open(prefix + ".collapsed", "w", encoding="utf-8") as handle:
+        handle.write("\n".join(collapsed_stacks(stats)) + "\n")
+
+    lines = [f"# {page} rerun, {seconds * 1000:.1f} ms, top {top} allocation sites by size"]
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  "
+                     f"{frame.filename}:{frame.lineno}")
+    with open(prefix + ".alloc.txt", "w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+
+    _rotate(directory, keep)
+
+
+@contextmanager
+def maybe_profile(page):
+    """Profile the enclosed rerun if sampling or ``?profile=1`` selects it."""
+    if not should_profile() or not _active.acquire(blocking=False):
+        yield
+        return
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        seconds = time.perf_counter() - started
+        # Whatever fails below, tracing must stop and the next rerun must be
+        # able to profile again; a broken profile never fails the page.
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ))
+            if started_tracing:
+                tracemalloc.stop()
+                started_tracing = False
+            _write(page, profiler, snapshot, seconds)
+        except Exception as exc:
+            logger.warning("Could not write %s profile: %s", page, exc)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            _active.release()
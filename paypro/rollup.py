@@ -0,0 +1,124 @@
+"""Monthly per-employee salary rollup kept next to ``salary_slips``.
+
+Usage (full rebuild, e.g. after a backfill):
+
+    python -m paypro.rollup rebuild [--username NAME]
+"""
+import argparse
+import time
+from datetime import date, datetime
+
+from paypro.money import to_paise, to_rupees
+
+ROLLUP_UPSERT_SQL = """
+            INSERT INTO salary_monthly_rollup (
+                username, employee_id, month, slip_count, take_home_total,
+                deductions_total, bonus_total, attendance_total
+            ) VALUES (
+                %(username)s, %(employee_id)s, %(month)s, %(slip_count)s, %(take_home_total)s,
+                %(deductions_total)s, %(bonus_total)s, %(attendance_total)s
+            ) ON DUPLICATE KEY UPDATE
+                slip_count = slip_count + VALUES(slip_count),
+                take_home_total = take_home_total + VALUES(take_home_total),
+                deductions_total = deductions_total + VALUES(deductions_total),
+                bonus_total = bonus_total + VALUES(bonus_total),
+                attendance_total = attendance_total + VALUES(attendance_total)
+            """
+
+# First day of the month without DATE_FORMAT, whose % signs would clash
+# with pymysql's parameter placeholders.
+_MONTH_EXPR = "DATE_SUB(DATE(calculation_date), INTERVAL DAYOFMONTH(calculation_date) - 1 DAY)"
+
+ROLLUP_REBUILD_SQL = f"""
+            INSERT INTO salary_monthly_rollup (
+                username, employee_id, month, slip_count, take_home_total,
+                deductions_total, bonus_total, attendance_total
+            )
+            SELECT username, employee_id, {_MONTH_EXPR} AS month, COUNT(*),
+                   SUM(take_home_salary), SUM(total_deductions), SUM(bonus),
+                   SUM(attendance_percentage)
+            FROM salary_slips
+            {{where}}
+            GROUP BY username, employee_id, month
+            """
+
+TREND_SQL = """
+            SELECT month, slip_count, take_home_total, deductions_total,
+                   bonus_total, attendance_total / slip_count AS attendance_avg
+            FROM salary_monthly_rollup
+            WHERE username = %s AND employee_id = %s
+            ORDER BY month DESC
+            LIMIT %s
+            """
+
+EMPLOYEES_SQL = """
+            SELECT DISTINCT employee_id
+            FROM salary_monthly_rollup
+            WHERE username = %s
+            ORDER BY employee_id
+            """
+
+
+def month_of(calculation_date):
+    if isinstance(calculation_date, (datetime, date)):
+        return calculation_date.strftime("%Y-%m-01")
+    return f"{str(calculation_date)[:7]}-01"
+
+
+def rollup_deltas(rows):
+    """Collapse slip rows into one rollup delta per (username, employee_id, month).
+
+    A payroll batch usually has one slip per employee, but pre-aggregating
+    keeps the upsert to a single statement per key even when it doesn't.
+    """
+    deltas = {}
+    for row in rows:
+        key = (row["username"], row["employee_id"], month_of(row["calculation_date"]))
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = {
+                "username": key[0],
+                "employee_id": key[1],
+                "month": key[2],
+                "slip_count": 0,
+                "take_home_total": 0,
+                "deductions_total": 0,
+                "bonus_total": 0,
+                "attendance_total": 0,
+            }
+        # Summed as whole hundredths so totals are exact, not float drift.
+        delta["slip_count"] += 1
+        delta["take_home_total"] += to_paise(row["take_home_salary"])
+        delta["deductions_total"] += to_paise(row["total_deductions"])
+        delta["bonus_total"] += to_paise(row["bonus"])
+        delta["attendance_total"] += to_paise(row["attendance_percentage"])
+    for delta in deltas.values():
+        for column in ("take_home_total", "deductions_total", "bonus_total", "attendance_total"):
+            delta[column] = to_rupees(delta[column])
+    return list(deltas.values())
+
+
+def apply_rollup(cursor, rows):
+    deltas = rollup_deltas(rows)
+    if deltas:
+        cursor.executemany(ROLLUP_UPSERT_SQL, deltas)
+
+
+def main(argv=None):
+    from paypro.storage import create_salary_storage
+
+    parser = argparse.ArgumentParser(description="Maintain salary_monthly_rollup.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    rebuild = subcommands.add_parser(
+        "rebuild", help="recompute the rollup from salary_slips")
+    rebuild.add_argument("--username", help="only rebuild this user's rows")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        started = time.perf_counter()
+        rows = create_salary_storage().rebuild_monthly_rollup(args.username)
+        print(f"Rebuilt {rows} rollup rows in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
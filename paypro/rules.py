@@ -0,0 +1,203 @@
+import hashlib
+import json
+import keyword
+import os
+import threading
+from fractions import Fraction
+
+import numpy as np
+
+from paypro.money import div_round, to_paise
+from paypro.tax import load_tax_table
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "salary_rules.json")
+
+KINDS = ("allowance", "insurance", "incentive", "deduction")
+
+# Names the generated evaluator defines itself; components can't reuse them.
+_RESERVED = {
+    "gross_salary", "present_days", "total_days", "gross_paise", "proportional_salary",
+    "attendance_pct", "total_deductions", "take_home", "_where", "_constant",
+    "_div", "_to_paise", "_whole_days",
+}
+
+
+class SalaryComponent:
+    """One allowance, deduction or incentive declared in the rules file.
+
+    ``key`` is the EmployeeSalary attribute, ``field`` the to_dict/DB column.
+    A component is ``rate`` x proportional salary, a fixed ``amount``, or
+    slab tax on proportional salary under ``tax_regime`` for ``tax_year``;
+    ``min_attendance`` makes it conditional on attendance %.  Values are
+    integer paise; a rate is applied as an exact fraction and rounded
+    half-up to the paisa.
+    """
+
+    def __init__(self, key, field, label, kind, rate=None, amount=None,
+                 min_attendance=None, short_label=None, tax_regime=None, tax_year=None):
+        if not key.isidentifier() or keyword.iskeyword(key) or key in _RESERVED:
+            raise ValueError(f"Invalid salary component key: {key!r}")
+        if kind not in KINDS:
+            raise ValueError(f"Component {key!r} has unknown kind {kind!r}")
+        if [rate, amount, tax_regime].count(None) != 2:
+            raise ValueError(
+                f"Component {key!r} needs exactly one of 'rate', 'amount' or 'tax_regime'")
+        if (tax_regime is None) != (tax_year is None):
+            raise ValueError(f"Component {key!r} needs both 'tax_regime' and 'tax_year'")
+        self.key = key
+        self.field = field
+        self.label = label
+        self.short_label = short_label or label
+        self.kind = kind
+        self.rate = rate
+        self.amount = amount
+        self.min_attendance = min_attendance
+        self.tax_table = load_tax_table(tax_regime, tax_year) if tax_regime else None
+
+    def _with_rate(self, label):
+        if self.tax_table is not None:
+            return f"{label} ({self.tax_table.regime.title()} Regime FY {self.tax_table.year})"
+        return f"{label} ({self.rate * 100:g}%)" if self.rate is not None else label
+
+    @property
+    def display_label(self):
+        return self._with_rate(self.label)
+
+    @property
+    def short_display_label(self):
+        return self._with_rate(self.short_label)
+
+    def expression(self):
+        if self.tax_table is not None:
+            value = f"_tax_{self.key}.monthly_tax(proportional_salary)"
+        elif self.rate is not None:
+            rate = Fraction(str(self.rate))
+            value = f"_div(proportional_salary * {rate.numerator}, {rate.denominator})"
+        else:
+            value = f"_constant({to_paise(str(self.amount))}, proportional_salary)"
+        if self.min_attendance is not None:
+            value = f"_where(attendance_pct >= {self.min_attendance!r}, {value}, 0)"
+        return value
+
+
+def _where(condition, value, otherwise):
+    if isinstance(condition, np.ndarray):
+        return np.where(condition, value, int(otherwise))
+    return value if condition else otherwise
+
+
+def _constant(amount, like):
+    if isinstance(like, np.ndarray):
+        return np.full(like.shape, amount, dtype=np.int64)
+    return amount
+
+
+def _whole_days(days):
+    if isinstance(days, np.ndarray):
+        if days.dtype.kind not in "iu":
+            if not np.array_equal(days, np.floor(days)):
+                raise ValueError("Attendance days must be whole numbers")
+        return days.astype(np.int64)
+    if days != int(days):
+        raise ValueError(f"Attendance days must be whole numbers, got {days!r}")
+    return int(days)
+
+
+def compile_components(components):
+    """Generate and compile one evaluation function for the whole rule set.
+
+    The function takes rupee gross salaries and whole days, as scalars or
+    NumPy arrays, and returns a dict of every component plus the derived
+    totals in integer paise (ints or int64 arrays).  Totals are sums of the
+    rounded components, so they reconcile exactly, and the scalar and array
+    paths give identical results.
+    """
+    deductions = [c.key for c in components if c.kind == "deduction"]
+    incentives = [c.key for c in components if c.kind == "incentive"]
+
+    lines = [
+        "def evaluate(gross_salary, present_days, total_days):",
+        "    gross_paise = _to_paise(gross_salary)",
+        "    proportional_salary = _div(gross_paise * _whole_days(present_days), _whole_days(total_days))",
+        "    attendance_pct = (present_days / total_days) * 100",
+    ]
+    lines += [f"    {c.key} = {c.expression()}" for c in components]
+    lines.append("    total_deductions = "
+                 + (" + ".join(deductions) or "_constant(0, proportional_salary)"))
+    lines.append("    take_home = proportional_salary - total_deductions"
+                 + "".join(f" + {key}" for key in incentives))
+    results = ["proportional_salary", "attendance_pct"] + [c.key for c in components] \
+        + ["total_deductions", "take_home"]
+    lines.append("    return {" + ", ".join(f"{name!r}: {name}" for name in results) + "}")
+    source = "\n".join(lines) + "\n"
+
+    namespace = {"_where": _where, "_constant": _constant, "_div": div_round,
+                 "_to_paise": to_paise, "_whole_days": _whole_days}
+    namespace.update((f"_tax_{c.key}", c.tax_table) for c in components if c.tax_table)
+    exec(compile(source, "<salary rules>", "exec"), namespace)
+    return namespace["evaluate"], source
+
+
+class RuleSet:
+    """Compiled components of one rules file.
+
+    ``fingerprint`` identifies the exact contents (version plus a hash of
+    the file), so caches keyed on it never serve results from an edited
+    file whose ``version`` was not bumped.
+    """
+
+    def __init__(self, version, components, digest=None):
+        self.version = version
+        self.fingerprint = f"{version}:{digest}" if digest else str(version)
+        self.components = components
+        self.evaluate, self.source = compile_components(components)
+        self._by_key = {component.key: component for component in components}
+
+    def component(self, key):
+        return self._by_key[key]
+
+    def earnings(self):
+        return [c for c in self.components if c.kind != "deduction"]
+
+    def deductions(self):
+        return [c for c in self.components if c.kind == "deduction"]
+
+    @property
+    def bonus_attendance_threshold(self):
+        thresholds = [c.min_attendance for c in self.components
+                      if c.kind == "incentive" and c.min_attendance is not None]
+        return min(thresholds) if thresholds else 0
+
+    @classmethod
+    def from_dict(cls, data, digest=None):
+        return cls(data["version"], [SalaryComponent(**spec) for spec in data["components"]],
+                   digest)
+
+
+_compiled = {}  # (path, content digest) -> RuleSet
+_loaded = {}  # path -> (mtime_ns, RuleSet)
+_lock = threading.Lock()
+
+
+def load_rule_set(path=DEFAULT_RULES_PATH):
+    """Compiled rule set for ``path``.
+
+    The file is only re-read when its mtime changes, and only recompiled
+    when its contents change, so per-employee calls cost one stat().
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    with _lock:
+        rule_set = _compiled.get((path, digest))
+        if rule_set is None:
+            rule_set = RuleSet.from_dict(json.loads(raw), digest)
+            _compiled[(path, digest)] = rule_set
+        _loaded[path] = (mtime, rule_set)
+    return rule_set
@@ -0,0 +1,225 @@
+"""Headless payroll run over a CSV or Parquet file, without Streamlit.
+
+Usage:
+
+    python -m paypro.runner employees.csv --username hr
+    python -m paypro.runner attendance.parquet --pdf-dir slips/ --chunk-size 20000
+
+The input needs employee_id, gross_salary, present_days and total_days
+columns, plus username unless ``--username`` is given.  Each chunk of rows
+is read, calculated with EmployeeSalaryBatch, saved through the configured
+storage backend (``PAYPRO_STORAGE``) and optionally rendered to PDFs before
+the next one is read, so memory stays flat however large the file is.
+Per-stage timings are printed for every chunk and for the whole run.
+
+Every chunk is validated before anything in it is saved.  Rows the salary
+form would refuse (blank or negative gross, blank or fractional days, more
+days present than in the month, a blank username) are skipped and listed
+by line (CSV) or row (Parquet), and the run exits with status 1.
+"""
+import argparse
+import resource
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from paypro.batch import EmployeeSalaryBatch, invalid_rows
+from paypro.bulk_pdf import BulkSlipRenderer
+from paypro.rules import load_rule_set
+from paypro.storage import create_salary_storage
+
+INPUT_COLUMNS = ("employee_id", "gross_salary", "present_days", "total_days")
+STAGES = ("read", "calculate", "save", "pdf")
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def _wanted(columns, username):
+    wanted = list(INPUT_COLUMNS) + ([] if username else ["username"])
+    missing = [name for name in wanted if name not in columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+    return wanted
+
+
+def is_parquet(path):
+    return path.lower().endswith(PARQUET_SUFFIXES)
+
+
+def read_chunks(path, chunk_size, username=None):
+    """DataFrames of at most ``chunk_size`` input rows, read lazily from ``path``."""
+    if is_parquet(path):
+        parquet = pq.ParquetFile(path)
+        columns = _wanted(parquet.schema_arrow.names, username)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            frame = batch.to_pandas()
+            frame["employee_id"] = frame["employee_id"].astype(str)
+            yield frame
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        columns = _wanted(header, username)
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns,
+                               dtype={"employee_id": str, "username": str})
+
+
+def _peak_rss_mib():
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class PayrollRun:
+    """Calculate, save and render slips chunk by chunk, timing each stage.
+
+    ``storage`` is a SalaryStorage (None to skip saving) and ``renderer`` a
+    BulkSlipRenderer (None to skip PDFs).  ``run`` returns the totals.
+    Invalid rows are reported and skipped rather than saved.
+    """
+
+    def __init__(self, storage=None, renderer=None, username=None, rule_set=None,
+                 report=print):
+        self.storage = storage
+        self.renderer = renderer
+        self.username = username
+        self.rule_set = rule_set or load_rule_set()
+        self.report = report
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.rows = 0
+        self.saved = 0
+        self.rendered = 0
+        self.failed_pdfs = 0
+        self.pdf_collisions = 0
+        self.rejected = 0
+
+    @contextmanager
+    def _stage(self, name, timings):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            timings[name] = elapsed
+            self.seconds[name] += elapsed
+
+    def _valid_rows(self, frame, describe):
+        problems = dict(invalid_rows(frame["gross_salary"].to_numpy(),
+                                     frame["present_days"].to_numpy(),
+                                     frame["total_days"].to_numpy()))
+        if not self.username:
+            for row in pd.isna(frame["username"].to_numpy()).nonzero()[0]:
+                problems.setdefault(int(row), "username is blank")
+        if not problems:
+            return frame
+        for row, reason in sorted(problems.items()):
+            self.report(f"  skipped {describe(row)}: {reason}")
+        self.rejected += len(problems)
+        return frame.drop(frame.index[sorted(problems)])
+
+    def process(self, frame, timings, describe=lambda row: f"row {row + 1}"):
+        """Validate, calculate, save and render one chunk.
+
+        ``describe(i)`` names the chunk's i-th row in the input file.
+        """
+        with self._stage("calculate", timings):
+            frame = self._valid_rows(frame, describe)
+            if frame.empty:
+                return
+            batch = EmployeeSalaryBatch.from_frame(frame, username=self.username)
+            batch.calculate(self.rule_set)
+            slips = batch.to_slip_batch().to_dicts()
+        if self.storage is not None:
+            with self._stage("save", timings):
+                self.saved += self.storage.save_employee_data_bulk(slips)["rows"]
+        if self.renderer is not None:
+            with self._stage("pdf", timings):
+                summary = self.renderer.render(slips)
+            self.rendered += summary["rendered"]
+            self.failed_pdfs += summary["failed"]
+            self.pdf_collisions += summary["collisions"]
+            for error in summary["errors"]:
+                self.report(f"  PDF failed for {error['employee_id']}: {error['error']}")
+        self.rows += len(slips)
+
+    def run(self, path, chunk_size=10000):
+        started = time.perf_counter()
+        chunks = read_chunks(path, chunk_size, self.username)
+        # CSV rows are named by file line (the header is line 1).
+        first_label = 1 if is_parquet(path) else 2
+        kind = "row" if is_parquet(path) else "line"
+        number = 0
+        offset = 0
+        while True:
+            timings = dict.fromkeys(STAGES, 0.0)
+            with self._stage("read", timings):
+                frame = next(chunks, None)
+            if frame is None:
+                break
+            number += 1
+            self.process(frame, timings,
+                         lambda row, base=offset: f"{kind} {base + row + first_label}")
+            offset += len(frame)
+            self.report(f"chunk {number}: {len(frame):,} rows  "
+                        + "  ".join(f"{name} {timings[name] * 1000:.0f} ms" for name in STAGES)
+                        + f"  peak rss {_peak_rss_mib():.0f} MiB")
+        return self.summary(time.perf_counter() - started)
+
+    def summary(self, elapsed):
+        return {
+            "rows": self.rows,
+            "saved": self.saved,
+            "rendered": self.rendered,
+            "failed_pdfs": self.failed_pdfs,
+            "pdf_collisions": self.pdf_collisions,
+            "rejected": self.rejected,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+            "stage_seconds": {name: round(value, 3) for name, value in self.seconds.items()},
+            "peak_rss_mib": round(_peak_rss_mib(), 1),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run payroll over a CSV or Parquet file.")
+    parser.add_argument("input", help="CSV file, or Parquet (.parquet/.pq)")
+    parser.add_argument("--username", help="owner of every slip (overrides a username column)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per chunk")
+    parser.add_argument("--backend", choices=("mysql", "sqlite"),
+                        help="storage backend (default: PAYPRO_STORAGE)")
+    parser.add_argument("--no-save", action="store_true", help="calculate without saving")
+    parser.add_argument("--pdf-dir", help="also render salary_slip_<employee_id>.pdf files here")
+    parser.add_argument("--workers", type=int, help="PDF worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    storage = None
+    if not args.no_save:
+        storage = create_salary_storage(args.backend)
+    renderer = None
+    if args.pdf_dir:
+        renderer = BulkSlipRenderer(args.pdf_dir, workers=args.workers)
+
+    try:
+        # One PDF worker pool for the whole run rather than one per chunk.
+        with renderer or nullcontext():
+            summary = PayrollRun(storage, renderer, args.username).run(args.input, args.chunk_size)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if storage is not None:
+            storage.close()
+
+    print(f"{summary['rows']:,} rows in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_sec']:,.0f} rows/s), {summary['saved']:,} saved, "
+          f"{summary['rejected']:,} rejected, {summary['rendered']:,} PDFs "
+          f"({summary['failed_pdfs']} failed, {summary['pdf_collisions']} renamed), "
+          f"peak rss {summary['peak_rss_mib']:.0f} MiB")
+    for name, seconds in summary["stage_seconds"].items():
+        print(f"  {name:<10}{seconds:>9.3f}s")
+    return 1 if summary["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from paypro.ids import new_slip_id, new_slip_ids
+from paypro.money import Money, to_paise, to_rupees
+from paypro.rules import load_rule_set
+
+
+class SlipIDGenerator:
+    # Time-ordered and unique across threads and processes; see paypro.ids.
+    @staticmethod
+    def generate():
+        return new_slip_id()
+
+    @staticmethod
+    def generate_many(count):
+        return new_slip_ids(count)
+
+
+class EmployeeSalary:
+    # No per-instance __dict__ for the standard components; one is only
+    # allocated if a custom rules file adds a component key not listed here.
+    __slots__ = (
+        "employee_id", "gross_salary", "present_days", "total_days", "username",
+        "calculation_date", "slip_id", "proportional_salary", "pf", "hra", "tax",
+        "da", "medical_insurance", "transport_allowance", "bonus", "attendance_pct",
+        "total_deductions", "take_home", "__dict__",
+    )
+
+    def __init__(self, employee_id, gross_salary, present_days,
+                 total_days, username,):
+        self.employee_id = employee_id
+        self.gross_salary = gross_salary
+        self.present_days = present_days
+        self.total_days = total_days
+        self.username = username
+        self.calculation_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.slip_id = SlipIDGenerator.generate()
+
+        self.proportional_salary = None
+        self.pf = None
+        self.hra = None
+        self.tax = None
+        self.da = None
+        self.medical_insurance = None
+        self.transport_allowance = None
+        self.bonus = None
+        self.attendance_pct = None
+        self.total_deductions = None
+        self.take_home = None
+
+    def calculate(self, rule_set=None):
+        # Rates and conditions come from paypro/salary_rules.json; every
+        # amount is exact Money in paise, attendance_pct stays a float.
+        rule_set = rule_set or load_rule_set()
+        results = rule_set.evaluate(
+            self.gross_salary, self.present_days, self.total_days)
+        for name, value in results.items():
+            setattr(self, name, value if name == "attendance_pct" else Money(value))
+
+    def to_dict(self):
+        return {
+            "slip_id": self.slip_id,
+            "employee_id": self.employee_id,
+            "username": self.username,
+            "calculation_date": self.calculation_date,
+            "present_days": self.present_days,
+            "total_days": self.total_days,
+            "gross_salary": to_rupees(to_paise(self.gross_salary)),
+            "proportional_salary": self.proportional_salary.rupees,
+            "pf_deduction": self.pf.rupees,
+            "tax_deduction": self.tax.rupees,
+            "hra": self.hra.rupees,
+            "da": self.da.rupees,
+            "medical_insurance": self.medical_insurance.rupees,
+            "transport_allowance": self.transport_allowance.rupees,
+            "bonus": self.bonus.rupees,
+            "attendance_percentage": round(self.attendance_pct, 2),
+            "total_deductions": self.total_deductions.rupees,
+            "take_home_salary": self.take_home.rupees,
+        }
@@ -0,0 +1,248 @@
+import re
+import threading
+
+from fpdf import FPDF
+
+from paypro.metrics import PDF_RENDER_SECONDS
+from paypro.rules import load_rule_set
+
+
+class SalarySlipPDF:
+    """Generates a professional PDF salary slip."""
+
+    pdf_class = FPDF
+
+    def __init__(self, slip_data, use_template=False):
+        self.slip_data = slip_data
+        self.use_template = use_template
+        self.rules = load_rule_set()
+        if use_template:
+            # The cached SlipTemplate draws the page; no FPDF needed here.
+            self.pdf = None
+            return
+        self.pdf = self.pdf_class()
+        self.pdf.add_page()
+        self.pdf.set_font("Arial", size=12)
+
+    def add_header(self):
+        self.pdf.set_font("Arial", "B", 16)
+        self.pdf.cell(0, 15, "SALARY SLIP", ln=True, align='C')
+        self.pdf.ln(5)
+
+    def add_employee_info(self):
+        self.pdf.set_font("Arial", "B", 12)
+        self.pdf.cell(0, 10, "EMPLOYEE DETAILS", ln=True)
+        self.pdf.set_font("Arial", size=10)
+
+        details = [
+            f"Slip ID: {self.slip_data.get('slip_id', 'N/A')}",
+            f"Employee ID: {self.slip_data.get('employee_id', 'N/A')}",
+            f"Employee Name: {self.slip_data.get('username', 'N/A')}",
+            f"Date: {self.slip_data.get('calculation_date', 'N/A')}",
+            f"Present Days: {self.slip_data.get('present_days', 0)}/{self.slip_data.get('total_days', 0)}"
+        ]
+
+        for detail in details:
+            self.pdf.cell(0, 8, detail, ln=True)
+        self.pdf.ln(5)
+
+    def add_earnings(self):
+        self.pdf.set_font("Arial", "B", 12)
+        self.pdf.cell(0, 10, "EARNINGS", ln=True)
+        self.pdf.set_font("Arial", size=10)
+
+        earnings = [("Proportional Salary", self.slip_data.get('proportional_salary', 0))] + [
+            (component.display_label, self.slip_data.get(component.field, 0))
+            for component in self.rules.earnings()
+        ]
+
+        for label, amount in earnings:
+            self.pdf.cell(100, 8, label, 0, 0)
+            self.pdf.cell(0, 8, f"Rs. {amount:,.2f}", ln=True, align='R')
+        self.pdf.ln(5)
+
+    def add_deductions(self):
+        self.pdf.set_font("Arial", "B", 12)
+        self.pdf.cell(0, 10, "DEDUCTIONS", ln=True)
+        self.pdf.set_font("Arial", size=10)
+
+        deductions = [
+            (component.display_label, self.slip_data.get(component.field, 0))
+            for component in self.rules.deductions()
+        ] + [("Total Deductions", self.slip_data.get('total_deductions', 0))]
+
+        for label, amount in deductions:
+            self.pdf.cell(100, 8, label, 0, 0)
+            self.pdf.cell(0, 8, f"Rs. {amount:,.2f}", ln=True, align='R')
+        self.pdf.ln(5)
+
+    def add_net_pay(self):
+        self.pdf.set_font("Arial", "B", 14)
+        self.pdf.cell(100, 12, "NET PAY", 0, 0)
+        self.pdf.cell(
+            0, 12, f"Rs. {self.slip_data.get('take_home_salary', 0):,.2f}", ln=True, align='R')
+
+    def layout(self):
+        self.add_header()
+        self.add_employee_info()
+        self.add_earnings()
+        self.add_deductions()
+        self.add_net_pay()
+
+    def generate(self):
+        if self.use_template:
+            with PDF_RENDER_SECONDS.time("template"):
+                return get_slip_template(self.rules).render(self.slip_data)
+        with PDF_RENDER_SECONDS.time("classic"):
+            self.layout()
+            return self.pdf.output(dest='S').encode('latin1')
+
+
+_FIELD_MARKER = re.compile(r"\x01(\d+)\x02")
+
+
+class _Field:
+    """Stand-in for a slip value that records how the layout formats it."""
+
+    def __init__(self, fields, key, default):
+        self.fields = fields
+        self.key = key
+        self.default = default
+
+    def __format__(self, spec):
+        self.fields.append((self.key, self.default, spec))
+        return f"\x01{len(self.fields) - 1}\x02"
+
+
+class _FieldRecorder(dict):
+    def __init__(self):
+        super().__init__()
+        self.fields = []
+
+    def get(self, key, default=None):
+        return _Field(self.fields, key, default)
+
+
+class _RecordingFPDF(FPDF):
+    """Draws static cells normally and records the ones holding slip values."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slots = []
+
+    def cell(self, w, h=0, txt='', border=0, ln=0, align='', fill=0, link=''):
+        if "\x01" not in txt:
+            return super().cell(w, h, txt, border, ln, align, fill, link)
+        if w == 0:
+            w = self.w - self.r_margin - self.x
+        self.slots.append((self.font_family, self.font_style, self.font_size_pt,
+                           self.x, self.y, w, h, txt, border, align, fill))
+        # Advance exactly as FPDF.cell would.
+        self.lasth = h
+        if ln > 0:
+            self.y += h
+            if ln == 1:
+                self.x = self.l_margin
+        else:
+            self.x += w
+
+
+class _SlipLayoutRecorder(SalarySlipPDF):
+    pdf_class = _RecordingFPDF
+
+
+class SlipTemplate:
+    """Precompiled SalarySlipPDF layout.
+
+    Compiling runs the normal SalarySlipPDF layout once against placeholder
+    values.  Titles, section labels and fonts are kept as a ready-made page
+    content stream, and every cell that shows a slip value becomes a slot
+    with its font command, baseline and alignment already worked out.
+    ``render`` only formats the values and appends one text operator per
+    slot, so the page is drawn exactly as ``generate()`` draws it.
+    """
+
+    def __init__(self, rules=None):
+        recorder = _SlipLayoutRecorder(_FieldRecorder())
+        if rules is not None:
+            recorder.rules = rules
+        recorder.layout()
+        self.rules_version = recorder.rules.fingerprint
+        pdf = recorder.pdf
+        self.fields = recorder.slip_data.fields
+        self.static_content = pdf.pages[1]
+        self.fonts = pdf.fonts
+        self.slots = []
+        k = pdf.k
+        for family, style, size, x, y, w, h, text, border, align, fill in pdf.slots:
+            if border or fill:
+                raise ValueError("SlipTemplate only supports plain text cells")
+            font = pdf.fonts[family + style]
+            font_size = size / k
+            self.slots.append({
+                "font_cmd": "BT /F%d %.2f Tf ET" % (font["i"], size),
+                "cw": font["cw"],
+                "font_size": font_size,
+                "baseline": (pdf.h - (y + .5 * h + .3 * font_size)) * k,
+                "x": x,
+                "w": w,
+                "c_margin": pdf.c_margin,
+                "k": k,
+                "align": align,
+                "text": text,
+            })
+
+    def _fill(self, text, slip):
+        def value(match):
+            key, default, spec = self.fields[int(match.group(1))]
+            return format(slip.get(key, default), spec)
+        return _FIELD_MARKER.sub(value, text)
+
+    def _text_op(self, slot, text):
+        # Mirrors the plain-text branch of FPDF.cell for core fonts.
+        if slot["align"] in ("R", "C"):
+            cw = slot["cw"]
+            width = sum(cw.get(char, 0) for char in text) * slot["font_size"] / 1000.0
+            if slot["align"] == "R":
+                dx = slot["w"] - slot["c_margin"] - width
+            else:
+                dx = (slot["w"] - width) / 2.0
+        else:
+            dx = slot["c_margin"]
+        escaped = (text.replace("\\", "\\\\").replace(")", "\\)")
+                   .replace("(", "\\(").replace("\r", "\\r"))
+        return "BT %.2f %.2f Td (%s) Tj ET" % (
+            (slot["x"] + dx) * slot["k"], slot["baseline"], escaped)
+
+    def render(self, slip):
+        lines = [self.static_content]
+        current_font = None
+        for slot in self.slots:
+            if slot["font_cmd"] != current_font:
+                current_font = slot["font_cmd"]
+                lines.append(current_font + "\n")
+            lines.append(self._text_op(slot, self._fill(slot["text"], slip)) + "\n")
+
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.pages[1] = "".join(lines)
+        # _putfonts writes object numbers into these dicts, so copy them.
+        pdf.fonts = {key: dict(font) for key, font in self.fonts.items()}
+        return pdf.output(dest='S').encode('latin1')
+
+
+_templates = {}  # rules fingerprint -> SlipTemplate
+_template_lock = threading.Lock()
+
+
+def get_slip_template(rules=None):
+    """Process-wide SlipTemplate for the current salary rules, compiled on first use."""
+    rules = rules or load_rule_set()
+    template = _templates.get(rules.fingerprint)
+    if template is None:
+        with _template_lock:
+            template = _templates.get(rules.fingerprint)
+            if template is None:
+                template = SlipTemplate(rules)
+                _templates[rules.fingerprint] = template
+    return template
@@ -0,0 +1,152 @@
+import os
+import sqlite3
+import threading
+
+from paypro.db import ConnectionPool
+from paypro.metrics import time_sql
+
+# Embedded equivalent of the MySQL tables plus sql/001-004.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    fullname  TEXT    NOT NULL,
+    phone     INTEGER NOT NULL,
+    dob       TEXT    NOT NULL,
+    email     TEXT    NOT NULL,
+    username  TEXT    NOT NULL COLLATE NOCASE,
+    password  TEXT    NOT NULL,
+    CONSTRAINT uq_users_username UNIQUE (username)
+);
+
+CREATE TABLE IF NOT EXISTS salary_slips (
+    slip_id                TEXT    PRIMARY KEY,
+    employee_id            TEXT    NOT NULL,
+    username               TEXT    NOT NULL,
+    calculation_date       TEXT    NOT NULL,
+    present_days           INTEGER NOT NULL,
+    total_days             INTEGER NOT NULL,
+    gross_salary           REAL    NOT NULL,
+    proportional_salary    REAL    NOT NULL,
+    pf_deduction           REAL    NOT NULL,
+    tax_deduction          REAL    NOT NULL,
+    hra                    REAL    NOT NULL,
+    da                     REAL    NOT NULL,
+    medical_insurance      REAL    NOT NULL,
+    transport_allowance    REAL    NOT NULL,
+    bonus                  REAL    NOT NULL,
+    attendance_percentage  REAL    NOT NULL,
+    total_deductions       REAL    NOT NULL,
+    take_home_salary       REAL    NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_salary_slips_user_date
+    ON salary_slips (username, calculation_date, slip_id);
+
+CREATE INDEX IF NOT EXISTS idx_salary_slips_user_employee_date
+    ON salary_slips (username, employee_id, calculation_date, slip_id);
+
+CREATE TABLE IF NOT EXISTS salary_monthly_rollup (
+    username          TEXT    NOT NULL,
+    employee_id       TEXT    NOT NULL,
+    month             TEXT    NOT NULL,
+    slip_count        INTEGER NOT NULL DEFAULT 0,
+    take_home_total   REAL    NOT NULL DEFAULT 0,
+    deductions_total  REAL    NOT NULL DEFAULT 0,
+    bonus_total       REAL    NOT NULL DEFAULT 0,
+    attendance_total  REAL    NOT NULL DEFAULT 0,
+    PRIMARY KEY (username, employee_id, month)
+);
+"""
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteConnection:
+    """sqlite3 connection with the begin/commit/ping surface ConnectionPool expects.
+
+    The connection runs in autocommit mode; ``begin()`` opens an IMMEDIATE
+    transaction so a writer takes the lock up front instead of failing on
+    upgrade.  sqlite3 keeps a per-connection cache of compiled statements,
+    so the storage classes reuse the same SQL strings as prepared statements.
+    """
+
+    def __init__(self, path, busy_timeout=10.0, cached_statements=256):
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None,
+            check_same_thread=False, cached_statements=cached_statements)
+        self._conn.row_factory = _dict_row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.open = True
+
+    def execute(self, sql, params=()):
+        with time_sql("sqlite", sql):
+            return self._conn.execute(sql, params)
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        with time_sql("sqlite", sql, rows=len(rows)):
+            return self._conn.executemany(sql, rows)
+
+    def executescript(self, script):
+        return self._conn.executescript(script)
+
+    def begin(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self._conn.execute("SELECT 1")
+
+    def close(self):
+        self.open = False
+        self._conn.close()
+
+
+class SQLitePool(ConnectionPool):
+    """ConnectionPool over one SQLite database file in WAL mode.
+
+    WAL lets readers run alongside the single writer, so the pool bounds
+    open file handles rather than serialising access.  The schema is
+    created on the first connection.
+    """
+
+    connection_errors = (sqlite3.OperationalError, sqlite3.InterfaceError)
+
+    def __init__(self, path, max_size=10, **pool_options):
+        super().__init__(max_size=max_size, database=path, **pool_options)
+        self.path = path
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self):
+        conn = SQLiteConnection(self.path)
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+        return conn
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_sqlite_pool(path, max_size=10):
+    """Return the process-wide pool for the database file at ``path``."""
+    path = os.path.abspath(path)
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = SQLitePool(path, max_size=max_size)
+            _pools[path] = pool
+        return pool
@@ -0,0 +1,148 @@
+from paypro import config
+from paypro.rollup import rollup_deltas
+from paypro.sqlite_db import get_sqlite_pool
+from paypro.storage import SalaryStorage
+
+INSERT_SQL = """
+            INSERT INTO salary_slips (
+                slip_id, employee_id, username, calculation_date,
+                present_days, total_days, gross_salary, proportional_salary,
+                pf_deduction, tax_deduction, hra, da, medical_insurance,
+                transport_allowance, bonus, attendance_percentage,
+                total_deductions, take_home_salary
+            ) VALUES (
+                :slip_id, :employee_id, :username, :calculation_date,
+                :present_days, :total_days, :gross_salary, :proportional_salary,
+                :pf_deduction, :tax_deduction, :hra, :da, :medical_insurance,
+                :transport_allowance, :bonus, :attendance_percentage,
+                :total_deductions, :take_home_salary
+            )
+            """
+
+ROLLUP_UPSERT_SQL = """
+            INSERT INTO salary_monthly_rollup (
+                username, employee_id, month, slip_count, take_home_total,
+                deductions_total, bonus_total, attendance_total
+            ) VALUES (
+                :username, :employee_id, :month, :slip_count, :take_home_total,
+                :deductions_total, :bonus_total, :attendance_total
+            ) ON CONFLICT (username, employee_id, month) DO UPDATE SET
+                slip_count = slip_count + excluded.slip_count,
+                take_home_total = round(take_home_total + excluded.take_home_total, 2),
+                deductions_total = round(deductions_total + excluded.deductions_total, 2),
+                bonus_total = round(bonus_total + excluded.bonus_total, 2),
+                attendance_total = round(attendance_total + excluded.attendance_total, 2)
+            """
+
+# calculation_date is stored as 'YYYY-MM-DD HH:MM:SS', as paypro.rollup.month_of expects.
+ROLLUP_REBUILD_SQL = """
+            INSERT INTO salary_monthly_rollup (
+                username, employee_id, month, slip_count, take_home_total,
+                deductions_total, bonus_total, attendance_total
+            )
+            SELECT username, employee_id, substr(calculation_date, 1, 7) || '-01' AS month,
+                   COUNT(*), round(SUM(take_home_salary), 2), round(SUM(total_deductions), 2),
+                   round(SUM(bonus), 2), round(SUM(attendance_percentage), 2)
+            FROM salary_slips
+            {where}
+            GROUP BY username, employee_id, month
+            """
+
+TREND_SQL = """
+            SELECT month, slip_count, take_home_total, deductions_total,
+                   bonus_total, attendance_total / slip_count AS attendance_avg
+            FROM salary_monthly_rollup
+            WHERE username = ? AND employee_id = ?
+            ORDER BY month DESC
+            LIMIT ?
+            """
+
+EMPLOYEES_SQL = """
+            SELECT DISTINCT employee_id
+            FROM salary_monthly_rollup
+            WHERE username = ?
+            ORDER BY employee_id
+            """
+
+HISTORY_COLUMNS = """
+            slip_id, employee_id, calculation_date, present_days, total_days,
+            gross_salary, bonus, total_deductions, take_home_salary,
+            attendance_percentage
+            """
+
+
+class EmployeeDataStorageSQLite(SalaryStorage):
+    """Salary storage in an embedded SQLite database (WAL mode).
+
+    Statements are module-level constants so each pooled connection's
+    statement cache compiles them once; every batch is one IMMEDIATE
+    transaction with an executemany for the slips and one for the rollup.
+    """
+
+    def __init__(self, path=None, bulk_batch_size=500):
+        self.bulk_batch_size = bulk_batch_size
+        self.pool = get_sqlite_pool(path or config.sqlite_path())
+
+    def _write_batch(self, connection, rows):
+        connection.begin()
+        try:
+            connection.executemany(INSERT_SQL, rows)
+            connection.executemany(ROLLUP_UPSERT_SQL, rollup_deltas(rows))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    def fetch_salary_history(self, username, employee_id=None, before=None, limit=20):
+        conditions = ["username = ?"]
+        params = [username]
+        if employee_id:
+            conditions.append("employee_id = ?")
+            params.append(employee_id)
+        if before is not None:
+            before_date, before_slip = before
+            conditions.append(
+                "(calculation_date < ? OR (calculation_date = ? AND slip_id < ?))")
+            params.extend([before_date, before_date, before_slip])
+        params.append(limit + 1)
+
+        sql = f"""
+            SELECT {HISTORY_COLUMNS}
+            FROM salary_slips
+            WHERE {' AND '.join(conditions)}
+            ORDER BY calculation_date DESC, slip_id DESC
+            LIMIT ?
+            """
+        with self.pool.connection() as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]["calculation_date"], rows[-1]["slip_id"])
+        return rows, next_cursor
+
+    def fetch_monthly_trend(self, username, employee_id, months=24):
+        with self.pool.connection() as connection:
+            return connection.execute(TREND_SQL, (username, employee_id, months)).fetchall()
+
+    def fetch_rollup_employees(self, username):
+        with self.pool.connection() as connection:
+            rows = connection.execute(EMPLOYEES_SQL, (username,)).fetchall()
+        return [row["employee_id"] for row in rows]
+
+    def rebuild_monthly_rollup(self, username=None):
+        where, params = "", ()
+        if username is not None:
+            where, params = "WHERE username = ?", (username,)
+        with self.pool.connection() as connection:
+            connection.begin()
+            try:
+                connection.execute("DELETE FROM salary_monthly_rollup " + where, params)
+                rebuilt = connection.execute(
+                    ROLLUP_REBUILD_SQL.format(where=where), params).rowcount
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return rebuilt
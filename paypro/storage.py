@@ -0,0 +1,217 @@
+import time
+from abc import ABC, abstractmethod
+from itertools import islice
+
+from paypro import config
+from paypro.db import get_pool
+from paypro.rollup import (apply_rollup, ROLLUP_REBUILD_SQL, TREND_SQL,
+                           EMPLOYEES_SQL)
+
+
+class SalaryStorage(ABC):
+    """Where salary slips and their monthly rollup are kept.
+
+    Implementations hold a ``pool`` (a ConnectionPool) and write one batch
+    of ``EmployeeSalary.to_dict()`` rows, plus its rollup deltas, in a
+    single transaction via ``_write_batch``.
+    """
+
+    bulk_batch_size = 500
+
+    @abstractmethod
+    def _write_batch(self, connection, rows):
+        """Insert ``rows`` and fold them into the rollup in one transaction."""
+
+    def save_employee_data(self, employee_data: dict):
+        with self.pool.connection() as connection:
+            # The slip and its salary_monthly_rollup update commit together.
+            self._write_batch(connection, [employee_data])
+
+    def save_employee_data_bulk(self, rows, batch_size=None):
+        """Insert many ``EmployeeSalary.to_dict()`` rows, one transaction per batch.
+
+        Each batch also folds its rows into ``salary_monthly_rollup``.
+        Returns a summary with the row count, batch count, elapsed seconds
+        and rows/sec so the batch size can be tuned against ``salary_slips``.
+        """
+        batch_size = batch_size or self.bulk_batch_size
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        rows = iter(rows)
+        saved = 0
+        batches = 0
+        started = time.perf_counter()
+        with self.pool.connection() as connection:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                self._write_batch(connection, batch)
+                saved += len(batch)
+                batches += 1
+        elapsed = time.perf_counter() - started
+
+        return {
+            "rows": saved,
+            "batches": batches,
+            "batch_size": batch_size,
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(saved / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+    @abstractmethod
+    def fetch_salary_history(self, username, employee_id=None, before=None, limit=20):
+        """One page of a user's slips, newest first, and the cursor of the next page."""
+
+    @abstractmethod
+    def fetch_monthly_trend(self, username, employee_id, months=24):
+        """Newest-first monthly totals, read from the rollup table only."""
+
+    @abstractmethod
+    def fetch_rollup_employees(self, username):
+        """Employee IDs that have rollup rows for ``username``."""
+
+    @abstractmethod
+    def rebuild_monthly_rollup(self, username=None):
+        """Recompute salary_monthly_rollup from salary_slips in one transaction."""
+
+    def pool_stats(self):
+        return self.pool.stats()
+
+    def close(self):
+        # Connections belong to the shared pool and outlive this instance.
+        pass
+
+
+class EmployeeDataStorageMySQL(SalaryStorage):
+    # Kept as a single VALUES tuple so pymysql's executemany can rewrite it
+    # into one multi-row INSERT per batch.
+    INSERT_SQL = """
+            INSERT  INTO salary_slips (
+                slip_id, employee_id, username, calculation_date,
+                present_days, total_days, gross_salary, proportional_salary,
+                pf_deduction, tax_deduction, hra, da, medical_insurance,
+                transport_allowance, bonus, attendance_percentage,
+                total_deductions, take_home_salary
+            ) VALUES (
+                %(slip_id)s, %(employee_id)s, %(username)s, %(calculation_date)s,
+                %(present_days)s, %(total_days)s, %(gross_salary)s, %(proportional_salary)s,
+                %(pf_deduction)s, %(tax_deduction)s, %(hra)s, %(da)s, %(medical_insurance)s,
+                %(transport_allowance)s, %(bonus)s, %(attendance_percentage)s,
+                %(total_deductions)s, %(take_home_salary)s
+            )
+            """
+
+    HISTORY_COLUMNS = """
+            slip_id, employee_id, calculation_date, present_days, total_days,
+            gross_salary, bonus, total_deductions, take_home_salary,
+            attendance_percentage
+            """
+
+    def __init__(self, host='localhost', user="root", password='root', database='employee_salary_data_db',
+                 bulk_batch_size=500):
+        self.bulk_batch_size = bulk_batch_size
+        self.pool = get_pool(
+            host='localhost',
+            user='root',
+            password='root',
+            database='employee_salary_data_db'
+        )
+
+    def _write_batch(self, connection, rows):
+        connection.begin()
+        try:
+            with connection.cursor() as cursor:
+                if len(rows) == 1:
+                    cursor.execute(self.INSERT_SQL, rows[0])
+                else:
+                    cursor.executemany(self.INSERT_SQL, rows)
+                apply_rollup(cursor, rows)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    def fetch_salary_history(self, username, employee_id=None, before=None, limit=20):
+        """One page of a user's slips, newest first, using keyset pagination.
+
+        ``before`` is the ``(calculation_date, slip_id)`` of the last row of
+        the previous page.  Returns ``(rows, next_cursor)``; ``next_cursor``
+        is None on the last page.  The seek predicate plus ORDER BY match
+        the (username[, employee_id], calculation_date, slip_id) indexes in
+        sql/001_salary_slips_history_indexes.sql, so each page reads only
+        ``limit + 1`` index entries no matter how deep the user pages.
+        """
+        conditions = ["username = %s"]
+        params = [username]
+        if employee_id:
+            conditions.append("employee_id = %s")
+            params.append(employee_id)
+        if before is not None:
+            before_date, before_slip = before
+            conditions.append(
+                "(calculation_date < %s OR (calculation_date = %s AND slip_id < %s))")
+            params.extend([before_date, before_date, before_slip])
+        params.append(limit + 1)
+
+        sql = f"""
+            SELECT {self.HISTORY_COLUMNS}
+            FROM salary_slips
+            WHERE {' AND '.join(conditions)}
+            ORDER BY calculation_date DESC, slip_id DESC
+            LIMIT %s
+            """
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]["calculation_date"], rows[-1]["slip_id"])
+        return rows, next_cursor
+
+    def fetch_monthly_trend(self, username, employee_id, months=24):
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(TREND_SQL, (username, employee_id, months))
+                return cursor.fetchall()
+
+    def fetch_rollup_employees(self, username):
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(EMPLOYEES_SQL, (username,))
+                return [row["employee_id"] for row in cursor.fetchall()]
+
+    def rebuild_monthly_rollup(self, username=None):
+        where, params = "", ()
+        if username is not None:
+            where, params = "WHERE username = %s", (username,)
+        with self.pool.connection() as connection:
+            connection.begin()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "DELETE FROM salary_monthly_rollup " + where, params)
+                    cursor.execute(ROLLUP_REBUILD_SQL.format(where=where), params)
+                    rebuilt = cursor.rowcount
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return rebuilt
+
+
+def create_salary_storage(backend=None, **settings):
+    """Salary storage for ``backend`` (default: ``PAYPRO_STORAGE``).
+
+    ``settings`` go to the backend's constructor, so callers can pass their
+    MySQL credentials and still run on SQLite when that is configured.
+    """
+    backend = backend or config.storage_backend()
+    if backend == "sqlite":
+        from paypro.sqlite_storage import EmployeeDataStorageSQLite
+        return EmployeeDataStorageSQLite(bulk_batch_size=settings.get("bulk_batch_size", 500))
+    return EmployeeDataStorageMySQL(**settings)
@@ -0,0 +1,106 @@
+import json
+import math
+import os
+import threading
+from bisect import bisect_right
+from fractions import Fraction
+
+import numpy as np
+
+from paypro.money import div_round, to_paise
+
+DEFAULT_TAX_SLABS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tax_slabs.json")
+
+
+class TaxTable:
+    """Progressive income-tax slabs for one regime and financial year.
+
+    ``slabs`` is a list of ``(lower_bound, rate)`` pairs in ascending order,
+    starting at 0.  The tax owed at every lower bound is precomputed, so
+    finding the bracket is a binary search and the tax is one multiply-add:
+    ``bisect`` for a single salary, ``np.searchsorted`` for a whole array.
+
+    Amounts are integer paise (see paypro.money).  Rates are scaled to
+    integers over a common ``denominator``, so the tax is exact until the
+    single half-up rounding at the end.
+    """
+
+    def __init__(self, regime, year, slabs, standard_deduction=0, rebate_limit=0,
+                 marginal_relief=False, cess_rate=0.0):
+        lower = [to_paise(str(bound)) for bound, _ in slabs]
+        if not lower or lower[0] != 0 or lower != sorted(set(lower)):
+            raise ValueError(f"Tax slabs for {regime} {year} must start at 0 and increase")
+        rates = [Fraction(str(rate)) for _, rate in slabs]
+        cess = Fraction(str(cess_rate))
+        self.regime = regime
+        self.year = year
+        self.denominator = math.lcm(*(rate.denominator for rate in rates + [cess]))
+        self.lower = lower
+        self.rates = [int(rate * self.denominator) for rate in rates]
+        self.base = [0]
+        for i in range(1, len(lower)):
+            self.base.append(self.base[-1] + (lower[i] - lower[i - 1]) * self.rates[i - 1])
+        self.standard_deduction = to_paise(str(standard_deduction))
+        self.rebate_limit = to_paise(str(rebate_limit))
+        self.marginal_relief = marginal_relief
+        self.cess_factor = int((1 + cess) * self.denominator)
+        self._lower = np.array(self.lower, dtype=np.int64)
+        self._rates = np.array(self.rates, dtype=np.int64)
+        self._base = np.array(self.base, dtype=np.int64)
+        # Largest annual income whose scaled intermediates fit in int64.
+        self._array_limit = np.iinfo(np.int64).max // (
+            4 * max(self.rates + [self.denominator]) * self.cess_factor)
+
+    def _scaled_tax(self, income):
+        # Tax plus cess on annual paise, times denominator ** 2.
+        if isinstance(income, np.ndarray):
+            if income.size and income.max() > self._array_limit:
+                raise OverflowError("Annual income too large for int64 tax arithmetic")
+            taxable = np.maximum(income - self.standard_deduction, 0)
+            i = np.searchsorted(self._lower, taxable, side="right") - 1
+            tax = self._base[i] + (taxable - self._lower[i]) * self._rates[i]
+            if self.marginal_relief:
+                tax = np.minimum(tax, (taxable - self.rebate_limit) * self.denominator)
+            tax = np.where(taxable <= self.rebate_limit, 0, tax)
+        else:
+            taxable = max(income - self.standard_deduction, 0)
+            i = bisect_right(self.lower, taxable) - 1
+            tax = self.base[i] + (taxable - self.lower[i]) * self.rates[i]
+            if self.marginal_relief:
+                tax = min(tax, (taxable - self.rebate_limit) * self.denominator)
+            if taxable <= self.rebate_limit:
+                tax = 0
+        return tax * self.cess_factor
+
+    def annual_tax(self, income):
+        """Tax plus cess in paise on annual ``income`` in paise (int or int64 array)."""
+        return div_round(self._scaled_tax(income), self.denominator ** 2)
+
+    def monthly_tax(self, monthly_income):
+        """Monthly share, in paise, of the annual tax on ``monthly_income`` x 12."""
+        return div_round(self._scaled_tax(monthly_income * 12), 12 * self.denominator ** 2)
+
+
+_tables = {}  # (path, regime, year) -> TaxTable
+_lock = threading.Lock()
+
+
+def load_tax_table(regime, year, path=DEFAULT_TAX_SLABS_PATH):
+    """Precomputed TaxTable for ``regime`` and ``year``, built once per process."""
+    key = (os.path.abspath(path), regime, year)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    with open(key[0], encoding="utf-8") as handle:
+        data = json.load(handle)
+    try:
+        spec = data["regimes"][regime][year]
+    except KeyError:
+        raise ValueError(f"No tax slabs for the {regime!r} regime in {year!r}") from None
+    with _lock:
+        table = _tables.get(key)
+        if table is None:
+            table = TaxTable(regime, year, cess_rate=data.get("cess_rate", 0.0), **spec)
+            _tables[key] = table
+    return table
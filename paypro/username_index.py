@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import math
+import threading
+
+from paypro.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` keys at ``error_rate``.
+
+    Bit positions come from double hashing one BLAKE2b digest, so each
+    lookup hashes the key once regardless of how many bits it checks.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def expected_error_rate(self):
+        """False-positive probability for the number of keys added so far."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+
+class UsernameIndex:
+    """In-process answer to "is this username taken?" for the sign-up form.
+
+    A Bloom filter warmed from ``users`` answers "definitely free" without a
+    query; an LRU of usernames the database confirmed as taken answers the
+    common resubmit case.  Anything else still goes to the database.  The
+    index only saves round trips: a name another process registered after
+    warm-up is caught by the UNIQUE constraint when the insert runs.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.01, taken_cache_entries=1024):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.taken = LRUCache(max_entries=taken_cache_entries)
+        self.ready = False
+        self._lock = threading.Lock()
+        self._checks = 0
+        self._definitely_free = 0
+        self._cached_taken = 0
+        self._db_queries = 0
+        self._false_positives = 0
+
+    @staticmethod
+    def _key(username):
+        # users.username uses a case-insensitive collation.
+        return username.casefold()
+
+    def warm(self, usernames):
+        with self._lock:
+            for username in usernames:
+                self.bloom.add(self._key(username))
+            self.ready = True
+
+    def add(self, username):
+        key = self._key(username)
+        with self._lock:
+            self.bloom.add(key)
+        self.taken.put(key, True)
+
+    def exists(self, username, lookup):
+        """Whether ``username`` is taken; ``lookup(username)`` queries the database."""
+        key = self._key(username)
+        with self._lock:
+            self._checks += 1
+            if self.ready and key not in self.bloom:
+                self._definitely_free += 1
+                return False
+        if self.taken.get(key):
+            with self._lock:
+                self._cached_taken += 1
+            return True
+
+        found = lookup(username)
+        with self._lock:
+            self._db_queries += 1
+            if self.ready and not found:
+                self._false_positives += 1
+        if found:
+            # Already in the filter once warm; only the LRU needs it.
+            self.taken.put(key, True)
+            if not self.ready:
+                with self._lock:
+                    self.bloom.add(key)
+        return found
+
+    def stats(self):
+        with self._lock:
+            free_checks = self._definitely_free + self._false_positives
+            return {
+                "ready": self.ready,
+                "usernames": self.bloom.count,
+                "checks": self._checks,
+                "queries_avoided": self._definitely_free + self._cached_taken,
+                "db_queries": self._db_queries,
+                "false_positives": self._false_positives,
+                "false_positive_rate": round(self._false_positives / free_checks, 4)
+                if free_checks else 0.0,
+                "expected_false_positive_rate": round(self.bloom.expected_error_rate(), 6),
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_username_index(load_usernames, **options):
+    """Return the process-wide index, warming it from ``load_usernames()``.
+
+    A failed warm-up leaves the index answering through the database and is
+    retried on the next call.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = UsernameIndex(**options)
+        if not _index.ready:
+            try:
+                _index.warm(load_usernames())
+            except Exception:
+                logger.warning("username index warm-up failed; using the database",
+                               exc_info=True)
+        return _index
+
+
+def username_index_stats():
+    """Stats of the process-wide index, or None before any page has built it."""
+    with _index_lock:
+        index = _index
+    return None if index is None else index.stats()
@@ -0,0 +1,134 @@
+import sqlite3
+from abc import ABC, abstractmethod
+
+import pymysql
+
+from paypro import config
+from paypro.db import get_pool
+from paypro.sqlite_db import get_sqlite_pool
+
+# MySQL error code for a duplicate key on a UNIQUE index.
+ER_DUP_ENTRY = 1062
+
+
+class UserStore(ABC):
+    """Account rows behind UserManager; hashing and caching stay in UserManager."""
+
+    @abstractmethod
+    def load_usernames(self):
+        """Every registered username, for warming the username index."""
+
+    @abstractmethod
+    def username_exists(self, username):
+        pass
+
+    @abstractmethod
+    def get_credentials(self, username):
+        """``{'id': ..., 'password': ...}`` for ``username``, or None."""
+
+    @abstractmethod
+    def update_password(self, user_id, old_hash, new_hash):
+        """Replace the stored hash unless another login already changed it."""
+
+    @abstractmethod
+    def insert_user(self, fullname, phone, dob, email, username, password_hash):
+        """Insert in one round trip; False if the username is already taken."""
+
+    def pool_stats(self):
+        return self.pool.stats()
+
+
+class UserStoreMySQL(UserStore):
+    def __init__(self, host='localhost', user='root', password='root', database='signup_db'):
+        self.pool = get_pool(
+            user=user,
+            password=password,
+            database=database
+        )
+
+    def load_usernames(self):
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT username FROM users")
+                return [row['username'] for row in cursor.fetchall()]
+
+    def username_exists(self, username):
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id FROM users WHERE username=%s", (username,))
+                return cursor.fetchone() is not None
+
+    def get_credentials(self, username):
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, password FROM users WHERE username=%s", (username,))
+                return cursor.fetchone()
+
+    def update_password(self, user_id, old_hash, new_hash):
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE users SET password=%s WHERE id=%s AND password=%s",
+                    (new_hash, user_id, old_hash))
+                connection.commit()
+
+    def insert_user(self, fullname, phone, dob, email, username, password_hash):
+        try:
+            with self.pool.connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO users (fullname, phone, dob, email, username, password) VALUES (%s, %s, %s, %s, %s, %s)",
+                        (fullname, phone, dob.strftime("%Y-%m-%d"), email, username, password_hash)
+                    )
+                    connection.commit()
+        except pymysql.err.IntegrityError as e:
+            if e.args[0] != ER_DUP_ENTRY:
+                raise
+            return False
+        return True
+
+
+class UserStoreSQLite(UserStore):
+    def __init__(self, path=None):
+        self.pool = get_sqlite_pool(path or config.sqlite_path())
+
+    def load_usernames(self):
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT username FROM users").fetchall()
+        return [row['username'] for row in rows]
+
+    def username_exists(self, username):
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT id FROM users WHERE username=?", (username,)).fetchone() is not None
+
+    def get_credentials(self, username):
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT id, password FROM users WHERE username=?", (username,)).fetchone()
+
+    def update_password(self, user_id, old_hash, new_hash):
+        with self.pool.connection() as connection:
+            connection.execute(
+                "UPDATE users SET password=? WHERE id=? AND password=?",
+                (new_hash, user_id, old_hash))
+
+    def insert_user(self, fullname, phone, dob, email, username, password_hash):
+        try:
+            with self.pool.connection() as connection:
+                connection.execute(
+                    "INSERT INTO users (fullname, phone, dob, email, username, password) VALUES (?, ?, ?, ?, ?, ?)",
+                    (fullname, phone, dob.strftime("%Y-%m-%d"), email, username, password_hash))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+
+def create_user_store(backend=None, **settings):
+    """User store for ``backend`` (default: ``PAYPRO_STORAGE``); see create_salary_storage."""
+    backend = backend or config.storage_backend()
+    if backend == "sqlite":
+        return UserStoreSQLite()
+    return UserStoreMySQL(**settings)
@@ -0,0 +1,220 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from paypro import config
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFullError(RuntimeError):
+    """Raised when the queue stays full for longer than the enqueue timeout."""
+
+
+class WriteBehindQueue:
+    """Buffers salary slips in memory and persists them from a worker thread.
+
+    Pages call ``enqueue`` and return immediately.  The worker collects rows
+    into batches and hands them to ``storage.save_employee_data_bulk`` once
+    ``batch_size`` rows are pending or the oldest pending row is
+    ``flush_interval`` seconds old.  ``capacity`` bounds memory: when the
+    database falls behind, ``enqueue`` blocks for up to ``enqueue_timeout``
+    seconds and then raises WriteBehindFullError.
+
+    A batch that fails to save is retried ``max_retries`` times, waiting
+    ``retry_backoff`` seconds and doubling the wait each time.  If it still
+    fails, its rows are appended to ``dead_letter_path`` (JSON lines,
+    default from paypro.config) for replay, and their slip IDs are kept so
+    ``failed_slip_ids`` can tell a page which of its slips were not saved.
+    """
+
+    _STOP = object()
+
+    def __init__(self, storage, capacity=10000, batch_size=200,
+                 flush_interval=1.0, enqueue_timeout=2.0, max_retries=3,
+                 retry_backoff=0.5, dead_letter_path=None, failed_id_limit=10000):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.dead_letter_path = dead_letter_path or config.dead_letter_path()
+        self.failed_id_limit = failed_id_limit
+        self._queue = queue.Queue(maxsize=capacity)
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._saved = 0
+        self._failed = 0
+        self._retries = 0
+        self._dead_lettered = 0
+        self._batches = 0
+        self._last_error = None
+        self._failed_ids = OrderedDict()  # slip_id -> None, oldest first
+        self._worker = threading.Thread(
+            target=self._run, name="paypro-write-behind", daemon=True)
+        self._worker.start()
+
+    def enqueue(self, row, timeout=None):
+        timeout = self.enqueue_timeout if timeout is None else timeout
+        try:
+            self._queue.put(row, timeout=timeout)
+        except queue.Full:
+            raise WriteBehindFullError(
+                f"Write-behind queue is full ({self._queue.maxsize} pending slips)") from None
+        with self._lock:
+            self._enqueued += 1
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is self._STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                row = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if row is self._STOP:
+                # Flush what we have, then stop.
+                self._queue.task_done()
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    def _run(self):
+        while True:
+            batch, stop = self._collect()
+            if batch:
+                self._write(batch)
+            if stop:
+                if not batch:
+                    self._queue.task_done()
+                return
+
+    def _write(self, batch):
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.storage.save_employee_data_bulk(batch, batch_size=len(batch))
+                except Exception as exc:
+                    with self._lock:
+                        self._last_error = str(exc)
+                    if attempt == self.max_retries:
+                        logger.exception("Failed to persist %d salary slips after %d attempts",
+                                         len(batch), attempt + 1)
+                        self._give_up(batch, exc)
+                        return
+                    with self._lock:
+                        self._retries += 1
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+                else:
+                    with self._lock:
+                        self._saved += len(batch)
+                        self._batches += 1
+                    return
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _give_up(self, batch, exc):
+        failed_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as handle:
+                for row in batch:
+                    handle.write(json.dumps({"failed_at": failed_at, "error": str(exc),
+                                             "slip": row}, default=str) + "\n")
+        except OSError:
+            logger.exception("Could not write %d unsaved salary slips to %s; they are lost",
+                             len(batch), self.dead_letter_path)
+        else:
+            with self._lock:
+                self._dead_lettered += len(batch)
+        with self._lock:
+            self._failed += len(batch)
+            for row in batch:
+                self._failed_ids[row.get("slip_id")] = None
+            while len(self._failed_ids) > self.failed_id_limit:
+                self._failed_ids.popitem(last=False)
+
+    def failed_slip_ids(self, slip_ids):
+        """The subset of ``slip_ids`` that could not be saved."""
+        with self._lock:
+            return [slip_id for slip_id in slip_ids if slip_id in self._failed_ids]
+
+    def flush(self, timeout=None):
+        """Block until every enqueued slip has been written (or has failed)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=10.0):
+        if not self._worker.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            # The database is too far behind to drain in time; keep what is
+            # still queued in the dead-letter file rather than hang or drop it.
+            pending = []
+            while True:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            logger.warning("Write-behind queue still full at shutdown; "
+                           "%d slips moved to %s", len(pending), self.dead_letter_path)
+            if pending:
+                self._give_up(pending, RuntimeError("not saved before shutdown"))
+                for _ in pending:
+                    self._queue.task_done()
+            return
+        self._worker.join(max(0.0, deadline - time.monotonic()))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self._queue.qsize(),
+                "capacity": self._queue.maxsize,
+                "enqueued": self._enqueued,
+                "saved": self._saved,
+                "failed": self._failed,
+                "retries": self._retries,
+                "dead_lettered": self._dead_lettered,
+                "dead_letter_path": self.dead_letter_path,
+                "batches": self._batches,
+                "last_error": self._last_error,
+            }
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_write_behind_queue(storage_factory, **options):
+    """Return the process-wide queue, creating it on first use.
+
+    The queue is flushed when the interpreter exits so a clean Streamlit
+    shutdown does not drop pending slips.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindQueue(storage_factory(), **options)
+            atexit.register(_writer.shutdown)
+        return _writer
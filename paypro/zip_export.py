@@ -0,0 +1,66 @@
+import io
+import zipfile
+
+from paypro.bulk_pdf import unique_slip_filename
+from paypro.slip_pdf import SalarySlipPDF
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only sink that hands back whatever zipfile wrote since the last drain.
+
+    It deliberately cannot seek or tell, so ZipFile falls back to streaming
+    mode (data descriptors after each member) and never rewinds.
+    """
+
+    def __init__(self):
+        self._chunks = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks += data
+        return len(data)
+
+    def drain(self):
+        data = bytes(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _render_slip(slip):
+    return SalarySlipPDF(slip, use_template=True).generate()
+
+
+def iter_slip_zip(slips, render=_render_slip, compression=zipfile.ZIP_DEFLATED):
+    """Yield a ZIP archive of salary slip PDFs chunk by chunk.
+
+    Each slip is rendered, compressed and yielded before the next one is
+    rendered, so memory stays at roughly one slip no matter how many there
+    are.  The chunks can be written to a file or streamed as an HTTP response.
+    """
+    sink = _StreamBuffer()
+    seen = set()
+    with zipfile.ZipFile(sink, mode="w", compression=compression) as archive:
+        for slip in slips:
+            name, _ = unique_slip_filename(slip, seen)
+            archive.writestr(name, render(slip))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Closing the archive writes the central directory.
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def write_slip_zip(slips, destination, render=_render_slip):
+    """Stream the archive into ``destination`` (a path or binary file); returns bytes written."""
+    if isinstance(destination, (str, bytes)) or hasattr(destination, "__fspath__"):
+        with open(destination, "wb") as handle:
+            return write_slip_zip(slips, handle, render)
+    written = 0
+    for chunk in iter_slip_zip(slips, render):
+        destination.write(chunk)
+        written += len(chunk)
+    return written
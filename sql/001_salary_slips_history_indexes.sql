@@ -0,0 +1,10 @@
+-- Composite indexes for the salary history page (keyset pagination).
+-- Each page seeks on (calculation_date, slip_id) below the previous page's
+-- last row and walks the index backwards, so latency does not grow with
+-- the number of slips a user has.
+
+CREATE INDEX idx_salary_slips_user_date
+    ON salary_slips (username, calculation_date, slip_id);
+
+CREATE INDEX idx_salary_slips_user_employee_date
+    ON salary_slips (username, employee_id, calculation_date, slip_id);
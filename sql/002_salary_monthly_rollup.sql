@@ -0,0 +1,17 @@
+-- Per-employee monthly totals behind the salary trends page.
+-- Maintained incrementally by EmployeeDataStorageMySQL on every insert into
+-- salary_slips; rebuild from scratch with `python -m paypro.rollup rebuild`.
+
+CREATE TABLE IF NOT EXISTS salary_monthly_rollup (
+    username          VARCHAR(255)  NOT NULL,
+    employee_id       VARCHAR(255)  NOT NULL,
+    month             DATE          NOT NULL,
+    slip_count        INT           NOT NULL DEFAULT 0,
+    take_home_total   DECIMAL(16,2) NOT NULL DEFAULT 0,
+    deductions_total  DECIMAL(16,2) NOT NULL DEFAULT 0,
+    bonus_total       DECIMAL(16,2) NOT NULL DEFAULT 0,
+    attendance_total  DECIMAL(12,2) NOT NULL DEFAULT 0,
+    updated_at        TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP
+                                    ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (username, employee_id, month)
+);
@@ -0,0 +1,6 @@
+-- Passwords are now stored as salted scrypt hashes
+-- ("scrypt$<n>$<r>$<p>$<salt>$<digest>", about 90 characters), so the
+-- column must hold more than a typical plain-text password.  Existing
+-- plain-text rows keep working and are rehashed on the user's next login.
+
+ALTER TABLE users MODIFY password VARCHAR(255) NOT NULL;
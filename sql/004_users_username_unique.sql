@@ -0,0 +1,9 @@
+-- Sign-up inserts in a single round trip and relies on this constraint to
+-- reject a username that is already taken (MySQL error 1062), instead of a
+-- SELECT followed by an INSERT with a race window in between.  The
+-- in-process username index only skips queries; this is what keeps
+-- usernames unique.
+--
+-- Remove any duplicate usernames before running it.
+
+ALTER TABLE users ADD CONSTRAINT uq_users_username UNIQUE (username);